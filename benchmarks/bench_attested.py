@@ -0,0 +1,65 @@
+"""Benchmark the attested-form lookup in analyze_endings.
+
+Compares the old linear scan over ALL_VERB_FORMS with the FORM_INDEX
+reverse index. Run from the repository root:
+
+    python benchmarks/bench_attested.py [--queries N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import verb_analyzer as va
+
+
+def linear_scan(verb_form):
+    """The pre-index lookup: first root whose form list contains verb_form"""
+    for root, forms in va.ALL_VERB_FORMS.items():
+        if verb_form in forms:
+            return [root]
+    return []
+
+
+def indexed(verb_form):
+    return va.FORM_INDEX.get(verb_form, [])
+
+
+def time_per_query(lookup, queries):
+    start = time.perf_counter()
+    for q in queries:
+        lookup(q)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    forms = sorted(va.FORM_INDEX)
+    # Half attested forms, half misses (the worst case for the linear scan)
+    queries = rng.sample(forms, min(args.queries // 2, len(forms)))
+    queries += [q + 'X' for q in queries]
+    rng.shuffle(queries)
+
+    start = time.perf_counter()
+    va.build_form_index(va.ALL_VERB_FORMS)
+    build = time.perf_counter() - start
+
+    before = time_per_query(linear_scan, queries)
+    after = time_per_query(indexed, queries)
+    print(f"forms indexed:  {len(forms)}")
+    print(f"index build:    {build * 1e3:.1f} ms (once, at load time)")
+    print(f"linear scan:    {before * 1e6:.1f} us/query")
+    print(f"FORM_INDEX:     {after * 1e6:.3f} us/query")
+    print(f"speedup:        {before / max(after, 1e-12):.0f}x")
+
+
+if __name__ == '__main__':
+    main()
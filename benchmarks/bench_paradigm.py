@@ -0,0 +1,54 @@
+"""Benchmark the paradigm table lookup against analyze_endings' search.
+
+Samples forms from verb_paradigms.bin and times analyze_endings on them
+with the table (one lookup) and without it (the ending/root search).
+Build the table first. Run from the repository root:
+
+    python paradigm.py build
+    python benchmarks/bench_paradigm.py [--queries N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import verb_analyzer as va
+
+
+def time_per_query(queries):
+    start = time.perf_counter()
+    for q in queries:
+        va.analyze_endings(q)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    data = va.DATA
+    table = data.paradigms
+    if table is None:
+        print("No current paradigm table; run `python paradigm.py build` first")
+        sys.exit(1)
+    rng = random.Random(args.seed)
+    ids = rng.sample(range(len(table)), min(args.queries, len(table)))
+    queries = [table.forms[i] for i in ids]
+
+    lookup = time_per_query(queries)
+    va.DATA = data._replace(paradigms=None)
+    search = time_per_query(queries)
+    va.DATA = data
+    print(f"forms in table: {len(table)}")
+    print(f"search:         {search * 1e6:.1f} us/query")
+    print(f"table lookup:   {lookup * 1e6:.1f} us/query")
+    print(f"speedup:        {search / max(lookup, 1e-12):.1f}x")
+
+
+if __name__ == '__main__':
+    main()
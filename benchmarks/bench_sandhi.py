@@ -0,0 +1,74 @@
+"""Check and benchmark sandhi candidate generation in analyze_endings.
+
+Compares sandhi_splits, which undoes the sandhi rules on the end of the
+form, with the nested ending x variant x cut loop it replaced. The script
+exits non-zero if any form yields different splits. Run from the
+repository root:
+
+    python benchmarks/bench_sandhi.py [--forms N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import verb_analyzer as va
+
+
+def nested_loop_splits(verb_form):
+    """The original search: try every ending, variant and cut of 1-3 characters"""
+    splits = []
+    for ending, info in va.ENDINGS.items():
+        for test_ending in [ending] + va.ENDING_VARIANTS.get(ending, []):
+            for i in range(1, min(4, len(verb_form))):
+                potential_root = verb_form[:-i]
+                sandhi_form = va.apply_sandhi_rules(potential_root, ending)
+                sandhi_form_M = (va.apply_sandhi_rules(potential_root, test_ending)
+                                 if test_ending != ending else None)
+                if sandhi_form == verb_form or sandhi_form_M == verb_form:
+                    splits.append((ending, test_ending, info, potential_root))
+    return splits
+
+
+def word_list(n, seed):
+    """Attested forms plus synthetic stem + glide + ending combinations"""
+    rng = random.Random(seed)
+    forms = sorted(va.FORM_INDEX)
+    words = rng.sample(forms, min(n // 2, len(forms)))
+    stems = sorted(va.VERB_ROOTS) or ['ho', 'bhaN']
+    surfaces = sorted({s for e in va.ENDINGS for s in [e] + va.ENDING_VARIANTS.get(e, [])})
+    while len(words) < n:
+        stem = rng.choice(stems) + rng.choice(['', 'i', 'u', 'e', 'M'])
+        words.append(va.apply_sandhi_rules(stem, rng.choice(surfaces)))
+    return words
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--forms', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    words = word_list(args.forms, args.seed)
+    mismatches = [w for w in words if nested_loop_splits(w) != va.sandhi_splits(w)]
+
+    timings = {}
+    for name, fn in (('nested loop', nested_loop_splits), ('sandhi_splits', va.sandhi_splits)):
+        start = time.perf_counter()
+        for w in words:
+            fn(w)
+        timings[name] = (time.perf_counter() - start) / len(words)
+        print(f"{name + ':':15} {timings[name] * 1e6:.1f} us/form")
+    print(f"speedup:        {timings['nested loop'] / timings['sandhi_splits']:.1f}x")
+
+    if mismatches:
+        print(f"{len(mismatches)} of {len(words)} forms differ, e.g. {mismatches[:5]}")
+        sys.exit(1)
+    print(f"{len(words)} forms: identical splits")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Check and benchmark the table-driven transliteration against aksharamukha.
+
+For every attested form in all_verb_forms.json (HK), compares
+hk_to_devanagari with aksharamukha, then devanagari_to_hk with
+aksharamukha on aksharamukha's Devanagari. Forms the tables do not cover
+are counted as fallbacks. The script exits non-zero if any output
+differs. Run from the repository root:
+
+    python benchmarks/bench_transliteration.py [--limit N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import verb_analyzer as va
+from transliteration import aksharamukha_process, devanagari_to_hk, hk_to_devanagari
+
+
+def check(name, fast, reference, inputs):
+    """Compare fast with reference on inputs; return the list of mismatches"""
+    fallbacks = 0
+    mismatches = []
+    for text in inputs:
+        out = fast(text)
+        if out is None:
+            fallbacks += 1
+        elif out != reference(text):
+            mismatches.append((text, out, reference(text)))
+
+    start = time.perf_counter()
+    for text in inputs:
+        reference(text)
+    slow = (time.perf_counter() - start) / len(inputs)
+    start = time.perf_counter()
+    for text in inputs:
+        fast(text)
+    quick = (time.perf_counter() - start) / len(inputs)
+
+    print(f"{name}: {len(inputs)} forms, {fallbacks} fallbacks, {len(mismatches)} mismatches")
+    print(f"  aksharamukha {slow * 1e6:.1f} us/form, tables {quick * 1e6:.1f} us/form "
+          f"({slow / quick:.0f}x)")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--limit', type=int, default=None,
+                        help="only check the first N forms (default: all)")
+    args = parser.parse_args()
+
+    hk_forms = sorted(va.FORM_INDEX)[:args.limit]
+    dev_forms = [aksharamukha_process('HK', 'Devanagari', f) for f in hk_forms]
+
+    mismatches = check('HK -> Devanagari', hk_to_devanagari,
+                       lambda t: aksharamukha_process('HK', 'Devanagari', t), hk_forms)
+    mismatches += check('Devanagari -> HK', devanagari_to_hk,
+                        lambda t: aksharamukha_process('Devanagari', 'HK', t), dev_forms)
+    for text, out, expected in mismatches[:10]:
+        print(f"  {text!r}: {out!r} != {expected!r}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
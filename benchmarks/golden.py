@@ -0,0 +1,101 @@
+"""Golden-output regression harness for the analyzer.
+
+`record` writes the full ranked output (the same records as
+`/analyze/batch`) for every word in the benchmark word lists to a golden
+NDJSON file. `check` re-analyses the inputs stored in that file and exits
+non-zero if any output differs, so an optimisation that silently changes
+an analysis fails the run. Record before changing the analyzer, check
+after:
+
+    python benchmarks/golden.py record [--size N] [--seed S] [--golden PATH]
+    python benchmarks/golden.py check [--golden PATH]
+
+The golden file depends on verbs.json, all_verb_forms.json and whether a
+current paradigm table (verb_paradigms.bin) is in use, so it is not
+committed. Its first line records that state, and `check` stops with an
+explanation if the current state differs; record it again whenever the
+data (rather than the code) changes.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import verb_analyzer as va
+from wordlists import CATEGORIES, build_wordlists
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden.ndjson')
+
+
+def analyze_all(forms):
+    return list(va.iter_batch_results(forms))
+
+
+def data_state():
+    """The inputs the golden output depends on besides the code"""
+    digest = hashlib.sha1()
+    for data_path in (va.VERBS_PATH, va.ALL_FORMS_PATH):
+        with open(data_path, 'rb') as f:
+            digest.update(f.read())
+    return {
+        "data": digest.hexdigest(),
+        "paradigm_table": va.DATA.paradigms is not None,
+    }
+
+
+def record(path, size, seed):
+    wordlists = build_wordlists(size, seed)
+    forms = list(dict.fromkeys(w for category in CATEGORIES for w in wordlists[category]))
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({"golden": data_state()}) + '\n')
+        for line in va.iter_ndjson(analyze_all(forms)):
+            f.write(line)
+    print(f"Recorded {len(forms)} forms to {path}")
+
+
+def check(path):
+    with open(path, encoding='utf-8') as f:
+        expected = [json.loads(line) for line in f if line.strip()]
+    recorded = expected.pop(0)['golden'] if expected and 'golden' in expected[0] else None
+    if recorded is None:
+        sys.exit(f"{path} has no header line; record it again")
+    current = data_state()
+    if recorded['data'] != current['data']:
+        sys.exit(f"{path} was recorded from different verbs.json/all_verb_forms.json; "
+                 "check against the data it was recorded with, or record it again")
+    if recorded['paradigm_table'] != current['paradigm_table']:
+        if recorded['paradigm_table']:
+            sys.exit(f"{path} was recorded with a current paradigm table, but there is none; "
+                     "run `python paradigm.py build` first")
+        sys.exit(f"{path} was recorded without a paradigm table, but one is in use; "
+                 "move verb_paradigms.bin aside first")
+    actual = analyze_all([record['input'] for record in expected])
+    # Compare through JSON so tuples/lists and float formatting match the file
+    actual = [json.loads(line) for line in va.iter_ndjson(actual)]
+    changed = [e['input'] for e, a in zip(expected, actual) if e != a]
+    if changed:
+        print(f"{len(changed)} of {len(expected)} forms changed, e.g.:")
+        for form in changed[:20]:
+            print(f"  {form}")
+        sys.exit(1)
+    print(f"All {len(expected)} forms match {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or check golden analyzer output")
+    parser.add_argument('command', choices=('record', 'check'))
+    parser.add_argument('--golden', default=GOLDEN_PATH)
+    parser.add_argument('--size', type=int, default=5000, help="words per category (record)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    if args.command == 'record':
+        record(args.golden, args.size, args.seed)
+    else:
+        check(args.golden)
+
+
+if __name__ == '__main__':
+    main()
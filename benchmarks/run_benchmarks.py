@@ -0,0 +1,119 @@
+"""Benchmark suite for the analyzer.
+
+Measures, in order:
+
+    cold import    wall time of `import verb_analyzer` in a fresh interpreter
+    peak RSS       of that interpreter once the lexicons are loaded
+    latency        p50/p99 of analyze_endings per word-list category
+    batch          tokens/sec through iter_batch_results on a Zipfian stream
+
+Run from the repository root, optionally saving the numbers as JSON to
+compare runs:
+
+    python benchmarks/run_benchmarks.py [--size N] [--seed S] [--json out.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+import verb_analyzer as va
+from wordlists import CATEGORIES, build_wordlists, zipf_stream
+
+# Run in a fresh interpreter: import time and peak RSS (ru_maxrss is KiB on Linux)
+IMPORT_PROBE = (
+    "import resource, time\n"
+    "start = time.perf_counter()\n"
+    "import verb_analyzer\n"
+    "elapsed = time.perf_counter() - start\n"
+    "print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)\n"
+)
+
+
+def cold_import(repeat):
+    """Return (median import seconds, max peak RSS in MiB) over repeat fresh imports"""
+    times, rss = [], []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', IMPORT_PROBE], cwd=ROOT, check=True,
+                             capture_output=True, text=True).stdout.split()
+        times.append(float(out[0]))
+        rss.append(int(out[1]) / 1024)
+    return statistics.median(times), max(rss)
+
+
+def percentile(sorted_values, p):
+    index = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def latency(words, repeat):
+    """Return (p50, p99) seconds of analyze_endings over words, each run repeat times"""
+    forms = [va.normalize_form(w)[1] for w in words]
+    samples = []
+    for _ in range(repeat):
+        # Cold per pass: only remainders shared within the list are memoised
+        va.clear_search_caches()
+        for form in forms:
+            start = time.perf_counter()
+            va.analyze_endings(form)
+            samples.append(time.perf_counter() - start)
+    samples.sort()
+    return percentile(samples, 50), percentile(samples, 99)
+
+
+def batch_throughput(tokens):
+    """Return tokens/sec for iter_batch_results over tokens, starting from a cold cache"""
+    va.RESULT_CACHE.clear()
+    start = time.perf_counter()
+    for _ in va.iter_batch_results(tokens):
+        pass
+    return len(tokens) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=500, help="words per category")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help="repeats per measurement")
+    parser.add_argument('--tokens', type=int, default=50000, help="batch stream length")
+    parser.add_argument('--json', help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = {'lexicon': 'mmap' if va.LEXICON is not None else 'json'}
+    import_time, peak_rss = cold_import(args.repeat)
+    results['cold_import_s'] = import_time
+    results['peak_rss_mib'] = peak_rss
+    print(f"lexicon:        {results['lexicon']}")
+    print(f"cold import:    {import_time * 1e3:.0f} ms")
+    print(f"peak RSS:       {peak_rss:.0f} MiB")
+
+    wordlists = build_wordlists(args.size, args.seed)
+    for category in CATEGORIES:
+        words = wordlists[category]
+        if not words:
+            print(f"{category + ':':15} (no words)")
+            continue
+        p50, p99 = latency(words, args.repeat)
+        results[f'{category}_p50_us'] = p50 * 1e6
+        results[f'{category}_p99_us'] = p99 * 1e6
+        print(f"{category + ':':15} p50 {p50 * 1e6:7.1f} us   p99 {p99 * 1e6:7.1f} us   ({len(words)} words)")
+
+    vocabulary = [w for category in CATEGORIES for w in wordlists[category]]
+    tokens = zipf_stream(vocabulary, args.tokens, args.seed)
+    results['batch_tokens_per_s'] = batch_throughput(tokens)
+    print(f"batch:          {results['batch_tokens_per_s']:.0f} tokens/sec "
+          f"({len(tokens)} Zipfian tokens over {len(vocabulary)} forms)")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
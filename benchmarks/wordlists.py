@@ -0,0 +1,95 @@
+"""Reproducible word lists for the benchmarks and the golden-output harness.
+
+Every list is drawn with a fixed seed from the loaded data, so the same
+data files and seed always give the same words. Categories:
+
+    attested    forms listed in all_verb_forms.json
+    unattested  verbs.json roots + endings, not in all_verb_forms.json
+    prefixed    a verbal prefix + an attested form
+    sandhi      stems in i/u + glide + ending, which only the sandhi pass splits
+
+Write them out for sharing or inspection with:
+
+    python benchmarks/wordlists.py --out benchmarks/wordlists [--size N] [--seed S]
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import verb_analyzer as va
+
+CATEGORIES = ('attested', 'unattested', 'prefixed', 'sandhi')
+
+
+def _surfaces():
+    return sorted({s for e in va.ENDINGS for s in [e] + va.ENDING_VARIANTS.get(e, [])})
+
+
+def _draw(rng, n, make, limit=20):
+    """Call make() until n distinct words are collected (or attempts run out)"""
+    words = {}
+    for _ in range(n * limit):
+        if len(words) >= n:
+            break
+        word = make()
+        if word:
+            words.setdefault(word, None)
+    return list(words)
+
+
+def build_wordlists(size=1000, seed=0):
+    """Return {category: [words]} with up to size words per category"""
+    rng = random.Random(seed)
+    attested = sorted(va.FORM_INDEX)
+    roots = sorted(va.VERB_ROOTS)
+    surfaces = _surfaces()
+    glide_endings = sorted(e for e in surfaces
+                           if any(e.startswith(init) for _, _, init in va.GLIDE_RULES))
+    glide_stems = [final for final, _, _ in va.GLIDE_RULES]
+
+    def unattested():
+        word = rng.choice(roots) + rng.choice(surfaces)
+        return word if word not in va.FORM_INDEX else None
+
+    def prefixed():
+        return rng.choice(list(va.PREFIXES)) + rng.choice(attested)
+
+    def sandhi():
+        stem = rng.choice(roots) + rng.choice(glide_stems)
+        word = va.apply_sandhi_rules(stem, rng.choice(glide_endings))
+        return word if word not in va.FORM_INDEX else None
+
+    return {
+        'attested': rng.sample(attested, min(size, len(attested))),
+        'unattested': _draw(rng, size, unattested) if roots else [],
+        'prefixed': _draw(rng, size, prefixed) if attested else [],
+        'sandhi': _draw(rng, size, sandhi) if roots and glide_endings else [],
+    }
+
+
+def zipf_stream(words, n_tokens, seed=0, exponent=1.1):
+    """Draw n_tokens from words with a Zipfian frequency distribution, like real text"""
+    rng = random.Random(seed)
+    weights = [1 / (rank ** exponent) for rank in range(1, len(words) + 1)]
+    return rng.choices(words, weights=weights, k=n_tokens)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the benchmark word lists")
+    parser.add_argument('--out', required=True, help="directory for <category>.txt files")
+    parser.add_argument('--size', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    os.makedirs(args.out, exist_ok=True)
+    for category, words in build_wordlists(args.size, args.seed).items():
+        path = os.path.join(args.out, f'{category}.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(words) + '\n')
+        print(f"{path}: {len(words)} words")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Analyze a whole Prakrit corpus in parallel.
+
+Tokenises the input text(s), shards the distinct tokens across a process
+pool and writes one NDJSON record per token, in input order, exactly as
+`verb_analyzer.py --batch` does. Output does not depend on the worker
+count or chunk size.
+
+    python corpus_analyzer.py corpus/*.txt --workers 8 --chunk-size 500 -o out.ndjson
+
+Workers are forked where the platform allows it, so they share the
+lexicon already loaded by the parent: the memory-mapped verb_lexicon.bin
+pages, or the parsed JSON pages copy-on-write if no lexicon was built.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import verb_analyzer as va
+
+
+def analyze_chunk(forms):
+    """Analyze a list of distinct forms; return their records in order"""
+    return list(va.iter_batch_results(forms))
+
+
+def chunked(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def analyze_corpus(tokens, workers=None, chunk_size=200):
+    """Return {form: record} for every distinct token, using a process pool"""
+    distinct = list(dict.fromkeys(tokens))
+    if workers == 1:
+        return {r['input']: r for r in analyze_chunk(distinct)}
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    records = {}
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        # map() yields chunks in submission order, keeping output deterministic
+        for chunk in pool.map(analyze_chunk, chunked(distinct, chunk_size)):
+            for record in chunk:
+                records[record['input']] = record
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze a Prakrit corpus in parallel")
+    parser.add_argument('inputs', nargs='*', default=['-'],
+                        help="text files to analyze ('-' for stdin, the default)")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(),
+                        help="worker processes (default: CPU count)")
+    parser.add_argument('-c', '--chunk-size', type=int, default=200,
+                        help="distinct forms sent to a worker at a time (default: 200)")
+    parser.add_argument('-o', '--output', default='-',
+                        help="NDJSON output file ('-' for stdout, the default)")
+    args = parser.parse_args()
+    if args.workers < 1 or args.chunk_size < 1:
+        parser.error("--workers and --chunk-size must be at least 1")
+
+    tokens = []
+    for path in args.inputs:
+        if path == '-':
+            tokens.extend(va.tokenize(sys.stdin.read()))
+        else:
+            with open(path, encoding='utf-8') as f:
+                tokens.extend(va.tokenize(f.read()))
+
+    start = time.perf_counter()
+    records = analyze_corpus(tokens, workers=args.workers, chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        for line in va.iter_ndjson(records[token] for token in tokens):
+            out.write(line)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    rate = len(tokens) / elapsed if elapsed else float('inf')
+    print(f"{len(tokens)} tokens ({len(records)} distinct) in {elapsed:.2f}s "
+          f"with {args.workers} workers: {rate:.0f} tokens/sec",
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Verb ending inventory and a reversed-string trie for matching it.
+
+endings.json lists every ending with its person, number, tense and base
+confidence, in the order candidates are generated (which breaks ties when
+analyses are ranked), plus the surface variants of some endings (e.g.
+Mti for nti). Add new paradigms there; no code change is needed.
+"""
+import json
+import os
+
+ENDINGS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'endings.json')
+
+
+def load_endings(path=ENDINGS_PATH):
+    """Load (ending -> info dict, ending -> [variant surface forms])"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    endings = {}
+    for entry in data['endings']:
+        entry = dict(entry)
+        endings[entry.pop('ending')] = entry
+    return endings, data.get('variants', {})
+
+
+class _Node:
+    __slots__ = ('children', 'entries')
+
+    def __init__(self):
+        self.children = {}
+        self.entries = []
+
+
+class EndingTrie:
+    """Trie over reversed endings: one backwards walk finds every ending of a word.
+
+    Matches come back as (ending, surface, info) tuples in the order of the
+    ending table, with each ending's variants right after it. `ending` is
+    the table ending and `surface` the string actually matched (the ending
+    itself or one of its variants).
+    """
+
+    def __init__(self, endings, variants=None):
+        variants = variants or {}
+        self._root = _Node()
+        order = 0
+        for ending, info in endings.items():
+            for surface in [ending] + list(variants.get(ending, [])):
+                node = self._root
+                for ch in reversed(surface):
+                    node = node.children.setdefault(ch, _Node())
+                node.entries.append((order, ending, surface, info))
+                order += 1
+
+    def match(self, word, variants=True):
+        """Return every (ending, surface, info) that word ends with"""
+        found = []
+        node = self._root
+        for ch in reversed(word):
+            node = node.children.get(ch)
+            if node is None:
+                break
+            found.extend(node.entries)
+        found.sort()
+        return [(ending, surface, info) for _, ending, surface, info in found
+                if variants or surface == ending]
@@ -0,0 +1,18 @@
+"""Production serving configuration, read by `gunicorn verb_analyzer:app`.
+
+The app is imported once in the master before the workers are forked, so
+the lexicon is loaded (and, for verb_lexicon.bin, memory-mapped) a single
+time and shared by every worker. Each worker is a process with a pool of
+threads: analysis is CPU-bound, so processes give parallelism across
+cores while threads keep a worker responsive and let identical in-flight
+requests be coalesced (see verb_analyzer.InFlight).
+"""
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+preload_app = True
+workers = int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+# Long enough for a large /analyze/batch stream
+timeout = 120
@@ -0,0 +1,111 @@
+"""Optional per-request timing spans and counters for the analyzer.
+
+A Profile collects stage timings and counters for one analysis. It lives
+in a thread-local slot for the duration of the request, and the hot path
+only asks `current()` for it. When instrumentation is off, current()
+returns None and no timing is done. Finished profiles are folded into a
+process-wide registry, served in Prometheus text format by render().
+
+Instrumentation is on for every request when ANALYZER_METRICS=1, and for
+a single request when it is forced (the /analyze ?profile=1 flag).
+"""
+import os
+import threading
+from time import perf_counter
+
+ENABLED = os.environ.get('ANALYZER_METRICS', '0') == '1'
+
+# Stages in the order they run, for stable output
+STAGES = ('transliteration', 'attested', 'paradigm', 'direct', 'sandhi', 'describe', 'serialisation')
+COUNTERS = ('candidates_generated', 'candidates_pruned', 'matches')
+
+_local = threading.local()
+_lock = threading.Lock()
+_stage_seconds = dict.fromkeys(STAGES, 0.0)
+_stage_count = dict.fromkeys(STAGES, 0)
+_counters = dict.fromkeys(COUNTERS, 0)
+_profiles = 0
+
+
+class Profile:
+    """Stage timings (seconds) and counters for one analysis"""
+    __slots__ = ('stages', 'counters')
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+    def add_time(self, stage, start):
+        """Add the time since start (a perf_counter() value) to stage"""
+        self.stages[stage] = self.stages.get(stage, 0.0) + perf_counter() - start
+
+    def count(self, counter, n=1):
+        self.counters[counter] += n
+
+    def as_dict(self):
+        return {
+            "stages_ms": {s: round(self.stages[s] * 1e3, 4) for s in STAGES if s in self.stages},
+            "counters": dict(self.counters),
+        }
+
+
+def current():
+    """The Profile of the analysis running on this thread, or None"""
+    return getattr(_local, 'profile', None)
+
+
+def begin(force=False):
+    """Start collecting for this thread if enabled (or forced); return the Profile or None"""
+    if not (ENABLED or force):
+        return None
+    profile = Profile()
+    _local.profile = profile
+    return profile
+
+
+def end(profile):
+    """Stop collecting for this thread and fold profile into the registry"""
+    global _profiles
+    if profile is None:
+        return
+    _local.profile = None
+    with _lock:
+        _profiles += 1
+        for stage, seconds in profile.stages.items():
+            _stage_seconds[stage] += seconds
+            _stage_count[stage] += 1
+        for counter, n in profile.counters.items():
+            _counters[counter] += n
+
+
+def render(extra=()):
+    """Return the registry in Prometheus text exposition format.
+
+    extra is an iterable of (name, type, help, value) for gauges/counters
+    owned elsewhere (e.g. the result cache). Every sample carries a pid
+    label: under gunicorn each worker process keeps its own registry, so
+    a scrape only sees the worker that served it, and the label keeps
+    each worker's counters a separate, monotonic series (sum them by pid).
+    """
+    pid = f'pid="{os.getpid()}"'
+    with _lock:
+        lines = [
+            "# HELP analyzer_profiles_total Analyses with instrumentation enabled.",
+            "# TYPE analyzer_profiles_total counter",
+            f"analyzer_profiles_total{{{pid}}} {_profiles}",
+            "# HELP analyzer_stage_seconds Time spent in each analysis stage.",
+            "# TYPE analyzer_stage_seconds summary",
+        ]
+        for stage in STAGES:
+            lines.append(f'analyzer_stage_seconds_sum{{stage="{stage}",{pid}}} {_stage_seconds[stage]:.9f}')
+            lines.append(f'analyzer_stage_seconds_count{{stage="{stage}",{pid}}} {_stage_count[stage]}')
+        lines += [
+            "# HELP analyzer_candidates_total Candidate analyses by outcome.",
+            "# TYPE analyzer_candidates_total counter",
+            f'analyzer_candidates_total{{outcome="generated",{pid}}} {_counters["candidates_generated"]}',
+            f'analyzer_candidates_total{{outcome="pruned",{pid}}} {_counters["candidates_pruned"]}',
+            f'analyzer_candidates_total{{outcome="returned",{pid}}} {_counters["matches"]}',
+        ]
+    for name, kind, help_text, value in extra:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name}{{{pid}}} {value}"]
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,309 @@
+"""Compact memory-mapped lexicon for the Prakrit verb data.
+
+`python lexicon.py build` compiles verbs.json and all_verb_forms.json into
+verb_lexicon.bin: sorted UTF-8 string tables with u32 offsets, plus
+postings lists linking forms and roots by id. verb_analyzer.py maps the
+file read-only, so forked workers share its pages, and every lookup is a
+binary search over the mapped bytes - the JSON is never materialised.
+
+File layout (all integers little-endian u32 unless noted):
+
+    header      magic b'PKLX', version, then one u64 offset per section
+    section     string table: count, offsets[count + 1], UTF-8 blob
+                postings:     count, offsets[count + 1], ids[...]
+                id list:      count, ids[count]
+
+Sections, in order: verb roots (sorted), roots (sorted), forms (sorted),
+form -> root ids, root -> form ids, root ids in original file order.
+"""
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping, Set
+
+MAGIC = b'PKLX'
+VERSION = 1
+SECTIONS = ('verb_roots', 'roots', 'forms', 'form_roots', 'root_forms', 'root_order')
+
+_U32 = struct.Struct('<I')
+_U32_PAIR = struct.Struct('<II')
+_HEADER = struct.Struct('<4sI' + 'Q' * len(SECTIONS))
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+VERBS_PATH = os.path.join(BASE_DIR, 'verbs.json')
+ALL_FORMS_PATH = os.path.join(BASE_DIR, 'all_verb_forms.json')
+LEXICON_PATH = os.path.join(BASE_DIR, 'verb_lexicon.bin')
+
+
+# --- Build ---------------------------------------------------------------
+
+def _pack_u32s(values):
+    return struct.pack(f'<{len(values)}I', *values)
+
+
+def _pack_string_table(strings):
+    blobs = [s.encode('utf-8') for s in strings]
+    offsets = [0]
+    for b in blobs:
+        offsets.append(offsets[-1] + len(b))
+    return _U32.pack(len(blobs)) + _pack_u32s(offsets) + b''.join(blobs)
+
+
+def _pack_postings(lists):
+    offsets = [0]
+    for ids in lists:
+        offsets.append(offsets[-1] + len(ids))
+    flat = [i for ids in lists for i in ids]
+    return _U32.pack(len(lists)) + _pack_u32s(offsets) + _pack_u32s(flat)
+
+
+def _utf8_key(s):
+    # Tables are searched by comparing UTF-8 bytes, so sort the same way
+    return s.encode('utf-8')
+
+
+def build_lexicon(verb_roots, verb_forms, out_path=LEXICON_PATH):
+    """Write a lexicon file from the verbs.json roots and a root -> [forms] mapping"""
+    verb_roots = sorted(set(verb_roots), key=_utf8_key)
+    roots = sorted(verb_forms, key=_utf8_key)
+    root_id = {r: i for i, r in enumerate(roots)}
+    forms = sorted({f for fs in verb_forms.values() for f in fs}, key=_utf8_key)
+    form_id = {f: i for i, f in enumerate(forms)}
+
+    # Roots per form keep the order of all_verb_forms.json, like FORM_INDEX
+    form_roots = [[] for _ in forms]
+    for root, fs in verb_forms.items():
+        for f in fs:
+            ids = form_roots[form_id[f]]
+            if root_id[root] not in ids:
+                ids.append(root_id[root])
+    root_forms = [[form_id[f] for f in verb_forms[r]] for r in roots]
+    root_order = [root_id[r] for r in verb_forms]
+
+    sections = [
+        _pack_string_table(verb_roots),
+        _pack_string_table(roots),
+        _pack_string_table(forms),
+        _pack_postings(form_roots),
+        _pack_postings(root_forms),
+        _U32.pack(len(root_order)) + _pack_u32s(root_order),
+    ]
+    offsets = []
+    pos = _HEADER.size
+    for data in sections:
+        offsets.append(pos)
+        pos += len(data)
+
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, *offsets))
+        for data in sections:
+            f.write(data)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def load_json_sources(verbs_path=VERBS_PATH, all_forms_path=ALL_FORMS_PATH):
+    """Load (verb roots, root -> [forms]) from the JSON data files"""
+    with open(verbs_path, encoding='utf-8') as f:
+        verb_roots = set(json.load(f).values())
+    with open(all_forms_path, encoding='utf-8') as f:
+        verb_forms = json.load(f)
+    return verb_roots, verb_forms
+
+
+def is_stale(lexicon_path=LEXICON_PATH, sources=(VERBS_PATH, ALL_FORMS_PATH)):
+    """True if the lexicon is missing or older than any of its JSON sources"""
+    if not os.path.exists(lexicon_path):
+        return True
+    built = os.path.getmtime(lexicon_path)
+    return any(os.path.exists(p) and os.path.getmtime(p) > built for p in sources)
+
+
+# --- Read ----------------------------------------------------------------
+
+class _StringTable:
+    """Sorted string table over a buffer, searched without decoding it"""
+
+    def __init__(self, buf, pos):
+        self._buf = buf
+        self._count = _U32.unpack_from(buf, pos)[0]
+        self._offsets = pos + 4
+        self._blob = self._offsets + 4 * (self._count + 1)
+
+    def __len__(self):
+        return self._count
+
+    def _span(self, i):
+        start, end = _U32_PAIR.unpack_from(self._buf, self._offsets + 4 * i)
+        return self._blob + start, self._blob + end
+
+    def __getitem__(self, i):
+        start, end = self._span(i)
+        return self._buf[start:end].decode('utf-8')
+
+    def find(self, s):
+        """Return the id of s, or -1 if it is not in the table"""
+        key = s.encode('utf-8')
+        # The hot loop of every lookup: _span inlined
+        buf, offsets, blob = self._buf, self._offsets, self._blob
+        unpack = _U32_PAIR.unpack_from
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start, end = unpack(buf, offsets + 4 * mid)
+            probe = buf[blob + start:blob + end]
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                return mid
+        return -1
+
+
+class _Postings:
+    """Lists of u32 ids, one list per string-table entry"""
+
+    def __init__(self, buf, pos):
+        self._buf = buf
+        count = _U32.unpack_from(buf, pos)[0]
+        self._offsets = pos + 4
+        self._ids = self._offsets + 4 * (count + 1)
+
+    def __getitem__(self, i):
+        start = _U32.unpack_from(self._buf, self._offsets + 4 * i)[0]
+        end = _U32.unpack_from(self._buf, self._offsets + 4 * i + 4)[0]
+        return struct.unpack_from(f'<{end - start}I', self._buf, self._ids + 4 * start)
+
+
+class VerbRootSet(Set):
+    """Read-only set of verbs.json roots backed by the lexicon"""
+
+    def __init__(self, table):
+        self._table = table
+
+    def __contains__(self, root):
+        return isinstance(root, str) and self._table.find(root) >= 0
+
+    def __iter__(self):
+        return (self._table[i] for i in range(len(self._table)))
+
+    def __len__(self):
+        return len(self._table)
+
+
+class FormsByRoot(Mapping):
+    """Read-only root -> [forms] mapping, the shape of all_verb_forms.json"""
+
+    def __init__(self, lexicon):
+        self._lex = lexicon
+
+    def __getitem__(self, root):
+        i = self._lex.roots.find(root)
+        if i < 0:
+            raise KeyError(root)
+        forms = self._lex.forms
+        return [forms[j] for j in self._lex.root_forms[i]]
+
+    def __iter__(self):
+        roots = self._lex.roots
+        return (roots[i] for i in self._lex.root_order)
+
+    def __len__(self):
+        return len(self._lex.roots)
+
+
+class RootsByForm(Mapping):
+    """Read-only form -> [roots] mapping, the shape of FORM_INDEX"""
+
+    def __init__(self, lexicon):
+        self._lex = lexicon
+
+    def __getitem__(self, form):
+        i = self._lex.forms.find(form)
+        if i < 0:
+            raise KeyError(form)
+        roots = self._lex.roots
+        return [roots[j] for j in self._lex.form_roots[i]]
+
+    def __iter__(self):
+        forms = self._lex.forms
+        return (forms[i] for i in range(len(forms)))
+
+    def __len__(self):
+        return len(self._lex.forms)
+
+
+class RootTrie:
+    """Prefix trie over verb roots: one forward walk finds the attested prefixes of a word"""
+
+    _END = None  # key under which a node stores the root ending there
+
+    def __init__(self, roots=()):
+        self._root = {}
+        for root in roots:
+            if root:
+                node = self._root
+                for ch in root:
+                    node = node.setdefault(ch, {})
+                node[self._END] = root
+
+    def longest_prefix(self, word):
+        """Return the longest root that word starts with, or None"""
+        found = None
+        node = self._root
+        for ch in word:
+            node = node.get(ch)
+            if node is None:
+                break
+            found = node.get(self._END, found)
+        return found
+
+    def prefixes(self, word):
+        """Return every root that word starts with, shortest first"""
+        found = []
+        node = self._root
+        for ch in word:
+            node = node.get(ch)
+            if node is None:
+                break
+            if self._END in node:
+                found.append(node[self._END])
+        return found
+
+
+class Lexicon:
+    """Memory-mapped view of a verb_lexicon.bin file"""
+
+    def __init__(self, path=LEXICON_PATH):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, *offsets = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} verb lexicon")
+        sections = dict(zip(SECTIONS, offsets))
+        self.path = path
+        self.verb_root_table = _StringTable(self._mm, sections['verb_roots'])
+        self.roots = _StringTable(self._mm, sections['roots'])
+        self.forms = _StringTable(self._mm, sections['forms'])
+        self.form_roots = _Postings(self._mm, sections['form_roots'])
+        self.root_forms = _Postings(self._mm, sections['root_forms'])
+        pos = sections['root_order']
+        count = _U32.unpack_from(self._mm, pos)[0]
+        self.root_order = struct.unpack_from(f'<{count}I', self._mm, pos + 4)
+
+        self.verb_roots = VerbRootSet(self.verb_root_table)
+        self.forms_by_root = FormsByRoot(self)
+        self.roots_by_form = RootsByForm(self)
+
+
+if __name__ == '__main__':
+    import sys
+    if len(sys.argv) < 2 or sys.argv[1] != 'build':
+        print("Usage: python lexicon.py build [output_path]")
+        sys.exit(1)
+    out = sys.argv[2] if len(sys.argv) > 2 else LEXICON_PATH
+    build_lexicon(*load_json_sources(), out_path=out)
+    print(f"Wrote {out} ({os.path.getsize(out)} bytes)")
@@ -0,0 +1,206 @@
+"""Offline full-paradigm table: every predicted surface form of every root.
+
+`python paradigm.py build` takes each root in verbs.json, bare and behind
+each verbal prefix, joins it to every ending in endings.json (and its
+written variants) with apply_sandhi_rules, and writes the predicted forms
+with their analyses to verb_paradigms.bin. verb_analyzer.py maps the file
+read-only and answers a form found there with a single lookup;
+analyze_endings' search stays the fallback for everything else.
+
+The build is incremental: roots already in the file keep their entries,
+only roots new to verbs.json are generated, and roots no longer there are
+dropped. The file records a signature of the generation rules (prefixes,
+endings, variants, glide rules); if it does not match, every paradigm is
+regenerated. Pass --full to force that after changing the rule code.
+
+File layout: a header (magic b'PKPD', version, one u64 offset per
+section) followed by lexicon.py string tables and postings:
+
+    signature   string table holding the rules signature
+    roots       string table, in the order the roots were added
+    prefixes    string table of prefix slots, '' (no prefix) first
+    endings     string table: table ending of each ending slot (nti)
+    surfaces    string table: written ending of each ending slot (Mti)
+    forms       sorted string table
+    analyses    postings: per form, its codes in ascending order
+
+A code packs (root id, prefix slot, ending slot, sandhi flag) into a u32.
+"""
+import json
+import mmap
+import os
+import struct
+
+from lexicon import (BASE_DIR, VERBS_PATH, _pack_postings, _pack_string_table,
+                     _Postings, _StringTable, _utf8_key)
+
+MAGIC = b'PKPD'
+VERSION = 1
+SECTIONS = ('signature', 'roots', 'prefixes', 'endings', 'surfaces', 'forms', 'analyses')
+
+_HEADER = struct.Struct('<4sI' + 'Q' * len(SECTIONS))
+
+PARADIGM_PATH = os.path.join(BASE_DIR, 'verb_paradigms.bin')
+
+
+def _encode(root_id, prefix_slot, ending_slot, sandhi, n_prefixes, n_endings):
+    return ((root_id * n_prefixes + prefix_slot) * n_endings + ending_slot) * 2 + int(sandhi)
+
+
+def _decode(code, n_prefixes, n_endings):
+    code, sandhi = divmod(code, 2)
+    code, ending_slot = divmod(code, n_endings)
+    root_id, prefix_slot = divmod(code, n_prefixes)
+    return root_id, prefix_slot, ending_slot, bool(sandhi)
+
+
+# --- Build ---------------------------------------------------------------
+
+def build_paradigms(roots, generate, prefixes, endings, signature,
+                    out_path=PARADIGM_PATH, full=False):
+    """Write a paradigm table for roots and return (generated, reused) root counts.
+
+    generate(root) yields (form, prefix slot, ending slot, sandhi) for one
+    root; prefixes lists the prefix slots and endings the (ending, surface)
+    slots it refers to. Unless full is set, paradigms in an existing table
+    built with the same signature are reused rather than generated again.
+    """
+    roots = list(dict.fromkeys(roots))
+    previous = None
+    if not full and os.path.exists(out_path):
+        try:
+            previous = ParadigmTable(out_path)
+        except ValueError:
+            previous = None
+        if previous is not None and previous.signature != signature:
+            previous = None
+
+    # Roots keep their ids across incremental builds: surviving roots first,
+    # in their old order, then new roots in verbs.json order
+    wanted = set(roots)
+    root_names = [r for r in previous.roots_in_order() if r in wanted] if previous else []
+    reused = set(root_names)
+    root_names += [r for r in roots if r not in reused]
+    root_id = {r: i for i, r in enumerate(root_names)}
+    n_prefixes, n_endings = len(prefixes), len(endings)
+
+    entries = {}
+    if previous:
+        for form, root, prefix_slot, ending_slot, sandhi in previous.entries():
+            if root in root_id:
+                code = _encode(root_id[root], prefix_slot, ending_slot, sandhi, n_prefixes, n_endings)
+                entries.setdefault(form, []).append(code)
+    for root in root_names:
+        if root in reused:
+            continue
+        for form, prefix_slot, ending_slot, sandhi in generate(root):
+            code = _encode(root_id[root], prefix_slot, ending_slot, sandhi, n_prefixes, n_endings)
+            entries.setdefault(form, []).append(code)
+
+    forms = sorted(entries, key=_utf8_key)
+    sections = [
+        _pack_string_table([signature]),
+        _pack_string_table(root_names),
+        _pack_string_table(prefixes),
+        _pack_string_table([ending for ending, _ in endings]),
+        _pack_string_table([surface for _, surface in endings]),
+        _pack_string_table(forms),
+        _pack_postings([sorted(set(entries[f])) for f in forms]),
+    ]
+    offsets = []
+    pos = _HEADER.size
+    for data in sections:
+        offsets.append(pos)
+        pos += len(data)
+
+    if previous:
+        previous.close()
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, *offsets))
+        for data in sections:
+            f.write(data)
+    os.replace(tmp_path, out_path)
+    return len(root_names) - len(reused), len(reused)
+
+
+def load_root_order(verbs_path=VERBS_PATH):
+    """The verbs.json roots in file order (the lexicon only keeps them sorted)"""
+    with open(verbs_path, encoding='utf-8') as f:
+        return list(dict.fromkeys(json.load(f).values()))
+
+
+# --- Read ----------------------------------------------------------------
+
+def _strings(table):
+    return [table[i] for i in range(len(table))]
+
+
+class ParadigmTable:
+    """Memory-mapped view of a verb_paradigms.bin file"""
+
+    def __init__(self, path=PARADIGM_PATH):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, *offsets = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} paradigm table")
+        sections = dict(zip(SECTIONS, offsets))
+        self.path = path
+        self.signature = _StringTable(self._mm, sections['signature'])[0]
+        self.roots = _StringTable(self._mm, sections['roots'])
+        self.forms = _StringTable(self._mm, sections['forms'])
+        self._analyses = _Postings(self._mm, sections['analyses'])
+        # The slot tables are tiny; decode them once
+        self.prefixes = _strings(_StringTable(self._mm, sections['prefixes']))
+        self.endings = _strings(_StringTable(self._mm, sections['endings']))
+        self.surfaces = _strings(_StringTable(self._mm, sections['surfaces']))
+
+    def __len__(self):
+        return len(self.forms)
+
+    def close(self):
+        self._mm.close()
+
+    def roots_in_order(self):
+        return _strings(self.roots)
+
+    def lookup(self, form):
+        """Return (root, prefix, ending, surface, sandhi) for each analysis of form"""
+        i = self.forms.find(form)
+        if i < 0:
+            return []
+        n_prefixes, n_endings = len(self.prefixes), len(self.endings)
+        found = []
+        for code in self._analyses[i]:
+            root_id, prefix_slot, ending_slot, sandhi = _decode(code, n_prefixes, n_endings)
+            found.append((self.roots[root_id], self.prefixes[prefix_slot],
+                          self.endings[ending_slot], self.surfaces[ending_slot], sandhi))
+        return found
+
+    def entries(self):
+        """Yield (form, root, prefix slot, ending slot, sandhi) for every analysis"""
+        n_prefixes, n_endings = len(self.prefixes), len(self.endings)
+        roots = self.roots_in_order()
+        for i in range(len(self.forms)):
+            form = self.forms[i]
+            for code in self._analyses[i]:
+                root_id, prefix_slot, ending_slot, sandhi = _decode(code, n_prefixes, n_endings)
+                yield form, roots[root_id], prefix_slot, ending_slot, sandhi
+
+
+if __name__ == '__main__':
+    import sys
+    args = sys.argv[1:]
+    full = '--full' in args
+    args = [a for a in args if a != '--full']
+    if not args or args[0] != 'build':
+        print("Usage: python paradigm.py build [--full] [output_path]")
+        sys.exit(1)
+    out = args[1] if len(args) > 1 else PARADIGM_PATH
+    # The generation rules live with the analyzer
+    import verb_analyzer as va
+    generated, reused = build_paradigms(load_root_order(), va.generate_paradigm, va.PARADIGM_PREFIXES,
+                                        va.PARADIGM_ENDINGS, va.PARADIGM_SIGNATURE, out_path=out, full=full)
+    print(f"Wrote {out} ({os.path.getsize(out)} bytes): "
+          f"{generated} paradigms generated, {reused} reused")
@@ -0,0 +1,142 @@
+"""Compact result records for analyses, and JSON serialisation.
+
+analyze_endings returns Analysis records rather than nested dicts. Notes
+are stored as codes (plus the values they mention) and only rendered into
+English sentences when a full-format response is serialised. The compact
+format sends the codes instead; NOTE_TEMPLATES and RELIABILITY map them to
+the sentences, and /analyze/codes serves both to clients.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the standard library
+    orjson = None
+
+NOTE_TEMPLATES = {
+    'form_attested': "Form '{form}' attested for root '{root}'.",
+    'form_generated': "Form predicted by the paradigm of root '{root}'.",
+    'root_attested': "Root '{root}' attested in Prakrit verb list.",
+    'root_unattested': "Root not attested in Prakrit verb list.",
+    'anusvara_written': "Anusvāra (M) used before nti/nte (written as Mti/Mte) in Prakrit.",
+    'anusvara': "Anusvāra (M) used before nti/nte in Prakrit.",
+    'prefix': "Found verbal prefix '{prefix}' (Sanskrit: '{sanskrit_prefix}')",
+    'sandhi': "Sandhi rules were applied in this analysis",
+    'past_all_persons': "Note: Past tense forms in Prakrit are the same for all persons and numbers",
+}
+
+RELIABILITY = {
+    'high': "High confidence analysis",
+    'medium': "Medium confidence analysis",
+    'low': "Low confidence analysis - please verify",
+}
+
+
+def render_note(code, **values):
+    return NOTE_TEMPLATES[code].format(**values)
+
+
+class Morphology:
+    """Person, number and tense of an ending, with the root and note of one analysis"""
+    __slots__ = ('person', 'number', 'tense', 'confidence', 'note', 'root')
+
+    def __init__(self, person, number, tense, confidence, note=None, root=None):
+        self.person = person
+        self.number = number
+        self.tense = tense
+        self.confidence = confidence
+        self.note = note
+        self.root = root
+
+    def to_dict(self, compact=False):
+        d = {'person': self.person, 'number': self.number, 'tense': self.tense,
+             'confidence': self.confidence}
+        if self.note:
+            d['note'] = self.note if compact else render_note(self.note)
+        if self.root:
+            d['root'] = self.root
+        return d
+
+
+class Analysis:
+    """One candidate analysis of a verb form"""
+    __slots__ = ('analysis', 'potential_root', 'ending', 'prefix', 'sanskrit_prefix',
+                 'confidence', 'sandhi_applied', 'notes', 'attested_form')
+
+    def __init__(self, analysis, potential_root, ending, prefix, sanskrit_prefix, confidence,
+                 sandhi_applied=False, notes=(), attested_form=None):
+        self.analysis = analysis
+        self.potential_root = potential_root
+        self.ending = ending
+        self.prefix = prefix
+        self.sanskrit_prefix = sanskrit_prefix
+        self.confidence = confidence
+        self.sandhi_applied = sandhi_applied
+        self.notes = notes  # note codes
+        self.attested_form = attested_form  # the form, for the 'form_attested' note
+
+    def _note_values(self):
+        return {'form': self.attested_form, 'root': self.analysis.root,
+                'prefix': self.prefix, 'sanskrit_prefix': self.sanskrit_prefix}
+
+    def _fields(self, compact):
+        d = {
+            'analysis': self.analysis.to_dict(compact),
+            'potential_root': self.potential_root,
+            'ending': self.ending,
+            'prefix': self.prefix,
+            'sanskrit_prefix': self.sanskrit_prefix,
+            'confidence': self.confidence,
+        }
+        if self.sandhi_applied:
+            d['sandhi_applied'] = True
+        return d
+
+    def to_dict(self, compact=False):
+        """The analysis as a dict, with its notes as sentences (or codes if compact)"""
+        d = self._fields(compact)
+        if compact:
+            d['notes'] = list(self.notes)
+        else:
+            values = self._note_values()
+            d['notes'] = [render_note(code, **values) for code in self.notes]
+        return d
+
+    def reliability(self):
+        """Reliability code for the confidence level"""
+        if self.confidence >= 0.9:
+            return 'high'
+        elif self.confidence >= 0.7:
+            return 'medium'
+        return 'low'
+
+    def explanation(self):
+        """Codes of the explanatory notes shown with this analysis"""
+        notes = []
+        if self.prefix:
+            notes.append('prefix')
+        if self.sandhi_applied:
+            notes.append('sandhi')
+        if self.analysis.tense == 'past' and self.analysis.person == 'all':
+            notes.append('past_all_persons')
+        return notes
+
+    def to_result(self, compact=False):
+        """The analysis as an /analyze result, with reliability and explanatory notes"""
+        d = self._fields(compact)
+        notes = self.explanation()
+        if compact:
+            d['notes'] = notes
+            d['reliability'] = self.reliability()
+        else:
+            values = self._note_values()
+            d['notes'] = [render_note(code, **values) for code in notes]
+            d['reliability'] = RELIABILITY[self.reliability()]
+        return d
+
+
+def dumps(obj):
+    """Serialise obj to a JSON string, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
@@ -0,0 +1,135 @@
+"""Table-driven Devanagari <-> Harvard-Kyoto transliteration.
+
+Covers the Prakrit character inventory (plus ś, ṣ, ḷ and the ai/au
+diphthongs) and reproduces aksharamukha's output for it, including the
+'_' it writes to mark a/i and a/u hiatus (भणइ -> bhaNa_i). Text with
+anything outside the tables (vedic accents, nukta letters, digits,
+punctuation, ॐ, ...) is handed to aksharamukha, which is only imported
+the first time that happens.
+"""
+VIRAMA = '्'
+# Zero-width joiners carry no sound; aksharamukha drops them too
+IGNORED = {'‌', '‍'}
+
+CONSONANTS = {
+    'क': 'k', 'ख': 'kh', 'ग': 'g', 'घ': 'gh', 'ङ': 'G',
+    'च': 'c', 'छ': 'ch', 'ज': 'j', 'झ': 'jh', 'ञ': 'J',
+    'ट': 'T', 'ठ': 'Th', 'ड': 'D', 'ढ': 'Dh', 'ण': 'N',
+    'त': 't', 'थ': 'th', 'द': 'd', 'ध': 'dh', 'न': 'n',
+    'प': 'p', 'फ': 'ph', 'ब': 'b', 'भ': 'bh', 'म': 'm',
+    'य': 'y', 'र': 'r', 'ल': 'l', 'व': 'v',
+    'श': 'z', 'ष': 'S', 'स': 's', 'ह': 'h', 'ळ': 'L',
+}
+VOWELS = {
+    'अ': 'a', 'आ': 'A', 'इ': 'i', 'ई': 'I', 'उ': 'u', 'ऊ': 'U',
+    'ए': 'e', 'ऐ': 'ai', 'ओ': 'o', 'औ': 'au',
+}
+MATRAS = {
+    'ा': 'A', 'ि': 'i', 'ी': 'I', 'ु': 'u', 'ू': 'U',
+    'े': 'e', 'ै': 'ai', 'ो': 'o', 'ौ': 'au',
+}
+MARKS = {'ं': 'M', 'ः': 'H', 'ँ': '~', 'ऽ': "'"}
+# Independent vowels written after an 'a' with a '_' between them, so the
+# hiatus is not read back as the diphthong ai/au
+HIATUS_VOWELS = {'i', 'u'}
+
+HK_CONSONANTS = {hk: dev for dev, hk in CONSONANTS.items()}
+HK_VOWELS = {hk: dev for dev, hk in VOWELS.items()}
+HK_MATRAS = {hk: dev for dev, hk in MATRAS.items()}
+HK_MARKS = {hk: dev for dev, hk in MARKS.items()}
+HK_TOKENS = set(HK_CONSONANTS) | set(HK_VOWELS) | set(HK_MARKS) | {'_'}
+HK_TOKEN_LENGTHS = sorted({len(t) for t in HK_TOKENS}, reverse=True)
+
+
+def devanagari_to_hk(text):
+    """Transliterate Devanagari to HK, or return None if text leaves the tables"""
+    out = []
+    pending = None  # HK of a consonant still waiting for its vowel
+    bare = False  # out ends with a consonant under virama
+    for ch in text:
+        if ch in IGNORED:
+            continue
+        if ch in MATRAS or ch == VIRAMA:
+            if pending is not None:
+                out.append(pending)
+                pending = None
+                bare = ch == VIRAMA
+                if not bare:
+                    out.append(MATRAS[ch])
+            else:
+                # A sign with no consonant to attach to
+                return None
+            continue
+        if pending is not None:
+            out.append(pending + 'a')
+            pending = None
+        if ch in CONSONANTS:
+            pending = CONSONANTS[ch]
+            # t + h is written t_h so it is not read back as th
+            if bare and out[-1] + pending[0] in HK_CONSONANTS:
+                out.append('_')
+        elif ch in VOWELS:
+            vowel = VOWELS[ch]
+            if vowel in HIATUS_VOWELS and out and out[-1].endswith('a'):
+                out.append('_')
+            out.append(vowel)
+        elif ch in MARKS:
+            out.append(MARKS[ch])
+        else:
+            return None
+        bare = False
+    if pending is not None:
+        out.append(pending + 'a')
+    return ''.join(out)
+
+
+def hk_to_devanagari(text):
+    """Transliterate HK to Devanagari, or return None if text leaves the tables"""
+    out = []
+    after_consonant = False
+    pos = 0
+    while pos < len(text):
+        # Longest token first, so 'kh' wins over 'k' and 'ai' over 'a'
+        for length in HK_TOKEN_LENGTHS:
+            token = text[pos:pos + length]
+            if token in HK_TOKENS:
+                break
+        else:
+            return None
+        pos += len(token)
+        if token in HK_VOWELS:
+            if after_consonant:
+                if token != 'a':
+                    out.append(HK_MATRAS[token])
+            else:
+                # aksharamukha may write an initial 'oM' as ॐ
+                if token == 'o' and text.startswith('M', pos):
+                    return None
+                out.append(HK_VOWELS[token])
+            after_consonant = False
+            continue
+        follows_consonant = after_consonant
+        if follows_consonant:
+            out.append(VIRAMA)
+        after_consonant = token in HK_CONSONANTS
+        if after_consonant:
+            out.append(HK_CONSONANTS[token])
+        elif token in HK_MARKS:
+            out.append(HK_MARKS[token])
+        elif not follows_consonant and not text.startswith(tuple(HIATUS_VOWELS), pos):
+            # '_' only marks hiatus before i/u; elsewhere it is kept
+            out.append('_')
+    if after_consonant:
+        out.append(VIRAMA)
+    return ''.join(out)
+
+
+_aksharamukha = None
+
+def aksharamukha_process(source, target, text):
+    """Transliterate with aksharamukha, importing it on first use"""
+    global _aksharamukha
+    if _aksharamukha is None:
+        import aksharamukha.transliterate as aksh
+        _aksharamukha = aksh
+    return _aksharamukha.process(source, target, text)
@@ -1,20 +1,188 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify
 import re
-import aksharamukha.transliterate as aksh
+import hashlib
+import heapq
 import json
+import math
 
 app = Flask(__name__)
 
-# Load Prakrit verb roots from verbs.json
 import os
-VERBS_PATH = os.path.join(os.path.dirname(__file__), 'verbs.json')
-with open(VERBS_PATH, encoding='utf-8') as f:
-    VERB_ROOTS = set(json.load(f).values())
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future
+from functools import lru_cache
+from time import perf_counter
+import instrumentation
+import lexicon
+import paradigm
+from endings import EndingTrie, load_endings
+from records import NOTE_TEMPLATES, RELIABILITY, Analysis, Morphology, dumps
+from transliteration import aksharamukha_process, devanagari_to_hk, hk_to_devanagari
 
-# Load all attested verb forms
-ALL_FORMS_PATH = os.path.join(os.path.dirname(__file__), 'all_verb_forms.json')
-with open(ALL_FORMS_PATH, encoding='utf-8') as f:
-    ALL_VERB_FORMS = json.load(f)
+# Reverse index: attested form -> every root it is attested under (homographs
+# keep all their roots, in the order they appear in all_verb_forms.json)
+def build_form_index(verb_forms):
+    """Build a form -> [roots] index from a root -> [forms] mapping"""
+    index = {}
+    for root, forms in verb_forms.items():
+        for form in forms:
+            roots = index.setdefault(form, [])
+            if root not in roots:
+                roots.append(root)
+    return index
+
+# Load Prakrit verb roots (verbs.json) and all attested verb forms
+# (all_verb_forms.json). If the compiled lexicon from `python lexicon.py build`
+# is up to date it is memory-mapped, so forked workers share one copy and
+# nothing is parsed at import; otherwise fall back to loading the JSON.
+VERBS_PATH = lexicon.VERBS_PATH
+ALL_FORMS_PATH = lexicon.ALL_FORMS_PATH
+DATA_PATHS = (VERBS_PATH, ALL_FORMS_PATH, lexicon.LEXICON_PATH, paradigm.PARADIGM_PATH)
+
+def data_signature():
+    """Modification times of the data files, to detect when they change"""
+    return tuple(os.path.getmtime(p) if os.path.exists(p) else None for p in DATA_PATHS)
+
+# One load of the data files. load_data() builds a new one and publishes it
+# with a single assignment to DATA, and the analyzer reads DATA once per
+# form, so a reload never mixes old and new data in one analysis. The
+# generation is bumped on every load; RESULT_CACHE and IN_FLIGHT use it to
+# keep results computed from older data out.
+LoadedData = namedtuple('LoadedData', 'generation signature lexicon verb_roots '
+                                      'all_verb_forms form_index root_trie paradigms')
+DATA = None
+
+def load_data():
+    """(Re)load the data files into a new DATA"""
+    global DATA, LEXICON, VERB_ROOTS, ROOT_TRIE, ALL_VERB_FORMS, FORM_INDEX, PARADIGMS, DATA_SIGNATURE
+    signature = data_signature()
+    if not lexicon.is_stale():
+        lex = lexicon.Lexicon()
+        verb_roots, all_verb_forms, form_index = lex.verb_roots, lex.forms_by_root, lex.roots_by_form
+    else:
+        lex = None
+        verb_roots, all_verb_forms = lexicon.load_json_sources()
+        form_index = build_form_index(all_verb_forms)
+    DATA = LoadedData(DATA.generation + 1 if DATA else 0, signature, lex, verb_roots, all_verb_forms,
+                      form_index, lexicon.RootTrie(verb_roots), load_paradigms())
+    # Module-level names for scripts (see benchmarks/); the analyzer uses DATA
+    (_, DATA_SIGNATURE, LEXICON, VERB_ROOTS, ALL_VERB_FORMS,
+     FORM_INDEX, ROOT_TRIE, PARADIGMS) = DATA
+
+class ResultCache:
+    """Thread-safe bounded LRU cache of analysis results with hit/miss counters.
+
+    Each value is put with the data generation it was computed from; values
+    from a generation older than the last clear() are dropped.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.generation = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, generation=0):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self, generation=None):
+        with self._lock:
+            self._data.clear()
+            if generation is not None:
+                self.generation = generation
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+class InFlight:
+    """Coalesces concurrent computations of the same key into one.
+
+    The first thread to ask for a key computes it; threads asking for the
+    same key meanwhile wait for that result instead of repeating the work.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def run(self, key, compute):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+        try:
+            future.set_result(compute())
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result()
+
+# Analysis results keyed on the normalised HK form. ANALYSIS_CACHE_SIZE=0
+# disables caching. The data files are re-checked at most every
+# DATA_CHECK_INTERVAL seconds; on a change the data is reloaded and the
+# cache cleared, and results still being computed from the old data are
+# not stored.
+RESULT_CACHE = ResultCache(int(os.environ.get('ANALYSIS_CACHE_SIZE', 10000)))
+DATA_CHECK_INTERVAL = float(os.environ.get('DATA_CHECK_INTERVAL', 5))
+_data_checked_at = time.monotonic()
+_reload_lock = threading.Lock()
+IN_FLIGHT = InFlight()
+
+def refresh_data_if_changed():
+    """Reload the data and clear RESULT_CACHE if a data file has changed"""
+    global _data_checked_at
+    now = time.monotonic()
+    if now - _data_checked_at < DATA_CHECK_INTERVAL:
+        return
+    with _reload_lock:
+        if now - _data_checked_at < DATA_CHECK_INTERVAL:
+            return
+        _data_checked_at = now
+        if data_signature() != DATA.signature:
+            load_data()
+            clear_search_caches()
+            RESULT_CACHE.clear(DATA.generation)
 
 def detect_script(text):
     """Detect if the input is in Devanagari or Harvard-Kyoto"""
@@ -23,12 +191,16 @@ def detect_script(text):
         return 'devanagari'
     return 'hk'
 
+@lru_cache(maxsize=int(os.environ.get('TRANSLITERATION_CACHE_SIZE', 65536)))
 def transliterate(text, from_script, to_script):
     """Transliterate between Devanagari and Harvard-Kyoto"""
+    # Table-driven converters first; aksharamukha only for what they don't cover
     if from_script == 'devanagari' and to_script == 'hk':
-        return aksh.process('Devanagari', 'HK', text)
+        result = devanagari_to_hk(text)
+        return result if result is not None else aksharamukha_process('Devanagari', 'HK', text)
     elif from_script == 'hk' and to_script == 'devanagari':
-        return aksh.process('HK', 'Devanagari', text)
+        result = hk_to_devanagari(text)
+        return result if result is not None else aksharamukha_process('HK', 'Devanagari', text)
     return text
 
 def is_valid_prakrit_sequence(text):
@@ -52,270 +224,519 @@ def is_valid_prakrit_sequence(text):
             return False
     return True
 
+# Glide insertion between stem and ending, as (stem final, glide, ending
+# initial). apply_sandhi_rules runs these forwards and undo_sandhi_rules
+# backwards, so a new rule added here is used in both directions.
+GLIDE_RULES = [
+    ('i', 'y', 'a'),  # i + a → iya
+    ('u', 'v', 'a'),  # u + a → uva
+]
+
+def sandhi_glide(stem, ending):
+    """Return the glide inserted between stem and ending ('' for hiatus)"""
+    for stem_final, glide, ending_initial in GLIDE_RULES:
+        if stem.endswith(stem_final) and ending.startswith(ending_initial):
+            return glide
+    return ''
+
 def apply_sandhi_rules(stem, ending):
     """Apply Prakrit sandhi rules between stem and ending"""
     # In Prakrit, many vowel combinations are preserved as hiatus
     # Only apply sandhi in specific cases where it's known to occur
+    # (glide insertion, see GLIDE_RULES)
     
-    # Cases where glides are inserted
-    if stem.endswith('i') and ending.startswith('a'):
-        return stem + 'y' + ending  # i + a → iya
-    if stem.endswith('u') and ending.startswith('a'):
-        return stem + 'v' + ending  # u + a → uva
-        
     # Most other vowel combinations remain as hiatus in Prakrit
     # For example:
     # a + i → ai (not e)
     # a + e → ae (not e)
     # i + e → ie
     # o + e → oe
-    return stem + ending
-
-def identify_prefix(verb_form):
-    """Identify possible Prakrit verbal prefixes"""
-    prefixes = {
-        'pa': 'pra',
-        'paḍi': 'prati',
-        'pari': 'pari',
-        'saṃ': 'sam',
-        'vi': 'vi',
-        'ā': 'ā',
-        'ni': 'ni',
-        'u': 'ud',
-        'aṇu': 'anu'
-    }
-    
-    for prefix, sanskrit in prefixes.items():
-        if verb_form.startswith(prefix):
-            return prefix, sanskrit
-    return None, None
-
-def analyze_endings(verb_form):
-    """Analyze verb endings to determine person, number, and tense with improved accuracy"""
-    # Present tense endings with variants
-    present_endings = {
-        'mi': {'person': 'first', 'number': 'singular', 'tense': 'present', 'confidence': 1.0},
-        'si': {'person': 'second', 'number': 'singular', 'tense': 'present', 'confidence': 1.0},
-        'se': {'person': 'second', 'number': 'singular', 'tense': 'present', 'confidence': 0.9},
-        'di': {'person': 'third', 'number': 'singular', 'tense': 'present', 'confidence': 1.0},
-        'i': {'person': 'third', 'number': 'singular', 'tense': 'present', 'confidence': 0.9},
-        'e': {'person': 'third', 'number': 'singular', 'tense': 'present', 'confidence': 0.9},
-        'ae': {'person': 'third', 'number': 'singular', 'tense': 'present', 'confidence': 0.85},
-        'mo': {'person': 'first', 'number': 'plural', 'tense': 'present', 'confidence': 1.0},
-        'mu': {'person': 'first', 'number': 'plural', 'tense': 'present', 'confidence': 0.9},
-        'ma': {'person': 'first', 'number': 'plural', 'tense': 'present', 'confidence': 0.9},
-        'ha': {'person': 'second', 'number': 'plural', 'tense': 'present', 'confidence': 1.0},
-        'tha': {'person': 'second', 'number': 'plural', 'tense': 'present', 'confidence': 0.9},
-        'nti': {'person': 'third', 'number': 'plural', 'tense': 'present', 'confidence': 1.0},
-        'nte': {'person': 'third', 'number': 'plural', 'tense': 'present', 'confidence': 0.9},
-        'mhi': {'person': 'first', 'number': 'singular', 'tense': 'present', 'confidence': 0.8},
-    }
-
-    # Future tense endings with variants
-    future_endings = {
-        'himi': {'person': 'first', 'number': 'singular', 'tense': 'future', 'confidence': 1.0},
-        'ssaM': {'person': 'first', 'number': 'singular', 'tense': 'future', 'confidence': 1.0},
-        'ssAmi': {'person': 'first', 'number': 'singular', 'tense': 'future', 'confidence': 0.9},
-        'issaM': {'person': 'first', 'number': 'singular', 'tense': 'future', 'confidence': 0.9},
-        'issAmi': {'person': 'first', 'number': 'singular', 'tense': 'future', 'confidence': 0.9},
-        'hisi': {'person': 'second', 'number': 'singular', 'tense': 'future', 'confidence': 1.0},
-        'hise': {'person': 'second', 'number': 'singular', 'tense': 'future', 'confidence': 0.9},
-        'issasi': {'person': 'second', 'number': 'singular', 'tense': 'future', 'confidence': 0.9},
-        'hi': {'person': 'third', 'number': 'singular', 'tense': 'future', 'confidence': 1.0},
-        'hii': {'person': 'third', 'number': 'singular', 'tense': 'future', 'confidence': 0.9},
-        'issa_e': {'person': 'third', 'number': 'singular', 'tense': 'future', 'confidence': 0.9},
-        'hie': {'person': 'third', 'number': 'singular', 'tense': 'future', 'confidence': 0.9},
-        'issa_i': {'person': 'third', 'number': 'singular', 'tense': 'future', 'confidence': 0.9},
-        'himo': {'person': 'first', 'number': 'plural', 'tense': 'future', 'confidence': 1.0},
-        'himu': {'person': 'first', 'number': 'plural', 'tense': 'future', 'confidence': 0.9},
-        'hima': {'person': 'first', 'number': 'plural', 'tense': 'future', 'confidence': 0.9},
-        'issAmo': {'person': 'first', 'number': 'plural', 'tense': 'future', 'confidence': 0.9},
-        'hitthA': {'person': 'second', 'number': 'plural', 'tense': 'future', 'confidence': 1.0},
-        'hiha': {'person': 'second', 'number': 'plural', 'tense': 'future', 'confidence': 0.9},
-        'issatha': {'person': 'second', 'number': 'plural', 'tense': 'future', 'confidence': 0.9},
-        'hinti': {'person': 'third', 'number': 'plural', 'tense': 'future', 'confidence': 1.0},
-        'hinte': {'person': 'third', 'number': 'plural', 'tense': 'future', 'confidence': 0.9},
-        'issanti': {'person': 'third', 'number': 'plural', 'tense': 'future', 'confidence': 0.9},
-        'issante': {'person': 'third', 'number': 'plural', 'tense': 'future', 'confidence': 0.9},
-    }
-
-    # Past tense endings with variants
-    past_endings = {
-        'sI': {'person': 'all', 'number': 'all', 'tense': 'past', 'confidence': 1.0},
-        'hI': {'person': 'all', 'number': 'all', 'tense': 'past', 'confidence': 1.0},
-        'hIa': {'person': 'all', 'number': 'all', 'tense': 'past', 'confidence': 0.9},
-        'Ia': {'person': 'all', 'number': 'all', 'tense': 'past', 'confidence': 0.9},
-        'itta': {'person': 'all', 'number': 'all', 'tense': 'past', 'confidence': 0.8},
-        'iya': {'person': 'all', 'number': 'all', 'tense': 'past', 'confidence': 0.8},
-    }
-
-    # Identify prefix if any
-    prefix, sanskrit_prefix = identify_prefix(verb_form)
-    if prefix:
-        verb_form = verb_form[len(prefix):]
-
-    # Combine all endings
-    all_endings = {**present_endings, **future_endings, **past_endings}
-    
+    return stem + sandhi_glide(stem, ending) + ending
+
+def undo_sandhi_rules(verb_form, max_cut=3):
+    """Yield (stem, ending, cut) with apply_sandhi_rules(stem, ending) == verb_form,
+    for each cut of the last 1..max_cut characters that leaves a non-empty stem"""
+    glides = [g for g in dict.fromkeys(g for _, g, _ in GLIDE_RULES) if g]
+    for cut in range(1, min(max_cut + 1, len(verb_form))):
+        stem, tail = verb_form[:-cut], verb_form[-cut:]
+        # Plain hiatus, unless a glide rule would have fired
+        if not sandhi_glide(stem, tail):
+            yield stem, tail, cut
+        for glide in glides:
+            if tail.startswith(glide) and sandhi_glide(stem, tail[len(glide):]) == glide:
+                yield stem, tail[len(glide):], cut
+
+# Prakrit verbal prefixes (in HK, like the forms they are matched against)
+# and their Sanskrit equivalents
+PREFIXES = {
+    'pa': 'pra',
+    'paDi': 'prati',
+    'pari': 'pari',
+    'saM': 'sam',
+    'vi': 'vi',
+    'A': 'ā',
+    'ni': 'ni',
+    'u': 'ud',
+    'aNu': 'anu'
+}
+# IAST spellings are still accepted in otherwise HK input
+PREFIX_ALIASES = {'paḍi': 'paDi', 'saṃ': 'saM', 'ā': 'A', 'aṇu': 'aNu'}
+PREFIX_TRIE = lexicon.RootTrie(list(PREFIXES) + list(PREFIX_ALIASES))
+# Most prefixes stacked in front of one root (saM+A+...)
+MAX_PREFIX_CHAIN = 3
+
+def prefix_chains(verb_form):
+    """Return every (chain, remainder) split of verb_form into a chain of prefixes
+    and a non-empty remainder, longest chains first; the last is ((), verb_form)"""
+    chains = []
+    def walk(pos, chain):
+        if len(chain) < MAX_PREFIX_CHAIN:
+            # Every prefix starting here at once: pa, paDi and pari alike
+            for prefix in PREFIX_TRIE.prefixes(verb_form[pos:]):
+                if pos + len(prefix) < len(verb_form) and prefix not in chain:
+                    walk(pos + len(prefix), chain + (prefix,))
+        chains.append((chain, verb_form[pos:]))
+    walk(0, ())
+    chains.sort(key=lambda c: len(c[1]))
+    return chains
+
+def chain_labels(chain):
+    """Return (prefix, sanskrit_prefix) for a prefix chain, joined with '+', or (None, None)"""
+    if not chain:
+        return None, None
+    return '+'.join(chain), '+'.join(PREFIXES[PREFIX_ALIASES.get(p, p)] for p in chain)
+
+# Person/number/tense endings (endings.json), compiled once into a trie
+ENDINGS, ENDING_VARIANTS = load_endings()
+ENDING_TRIE = EndingTrie(ENDINGS, ENDING_VARIANTS)
+
+def build_sandhi_endings(endings, variants):
+    """Map each ending surface to the (order, ending, test_ending, info) it matches
+    in the sandhi pass. A variant (Mti) is accepted when either it or its table
+    ending (nti) reconstructs the form, so a table ending also maps to its variants."""
+    index = {}
+    order = 0
+    for ending, info in endings.items():
+        for test_ending in [ending] + list(variants.get(ending, [])):
+            for surface in dict.fromkeys([ending, test_ending]):
+                index.setdefault(surface, []).append((order, ending, test_ending, info))
+            order += 1
+    return index
+
+SANDHI_ENDINGS = build_sandhi_endings(ENDINGS, ENDING_VARIANTS)
+
+def sandhi_splits(verb_form):
+    """Return (ending, test_ending, info, stem) for every split of verb_form that
+    the sandhi rules reconstruct, in ending-table order then by cut length"""
+    splits = {}
+    for stem, surface, cut in undo_sandhi_rules(verb_form):
+        for order, ending, test_ending, info in SANDHI_ENDINGS.get(surface, ()):
+            splits[order, cut] = (ending, test_ending, info, stem)
+    return [splits[key] for key in sorted(splits)]
+
+def plausible_stem(stem, ending):
+    """Filters a stem + ending split must pass to be analysed"""
+    # Root should not end with 'a'
+    if stem.endswith('a'):
+        return False
+    # 'i' ending must be preceded by a vowel
+    if ending == 'i' and (len(stem) == 0 or stem[-1] not in 'aeiouAEIOU'):
+        return False
+    return True
+
+def anusvara_note(ending, test_ending, stem):
+    """Note code for Mti/Mte forms (anusvāra), or None"""
+    if test_ending in ['Mti', 'Mte']:
+        return 'anusvara_written'
+    elif ending in ['nti', 'nte'] and len(stem) > 0 and stem[-1] == 'M':
+        return 'anusvara'
+    return None
+
+# Slots of the paradigm table (paradigm.py): no prefix and every prefix, and
+# every ending with each way it is written (nti, Mti), in table order
+PARADIGM_PREFIXES = [''] + list(PREFIXES)
+PARADIGM_ENDINGS = [(ending, surface) for ending in ENDINGS
+                    for surface in [ending] + list(ENDING_VARIANTS.get(ending, []))]
+# Changes when the generation rules do, so an outdated table is not used
+PARADIGM_SIGNATURE = hashlib.sha1(json.dumps(
+    [PARADIGM_PREFIXES, PARADIGM_ENDINGS, ENDINGS, GLIDE_RULES], ensure_ascii=False
+).encode('utf-8')).hexdigest()
+
+def generate_paradigm(root):
+    """Yield (form, prefix slot, ending slot, sandhi) for every form predicted for root:
+    the ending joined with apply_sandhi_rules, bare and behind each prefix"""
+    if not root or not is_valid_prakrit_sequence(root):
+        return
+    for ending_slot, (ending, surface) in enumerate(PARADIGM_ENDINGS):
+        if not plausible_stem(root, ending):
+            continue
+        word = apply_sandhi_rules(root, surface)
+        sandhi = len(word) != len(root) + len(surface)
+        for prefix_slot, prefix in enumerate(PARADIGM_PREFIXES):
+            yield prefix + word, prefix_slot, ending_slot, sandhi
+
+def load_paradigms():
+    """The paradigm table if it is current, else None"""
+    if lexicon.is_stale(paradigm.PARADIGM_PATH, (VERBS_PATH,)):
+        return None
+    try:
+        table = paradigm.ParadigmTable()
+    except ValueError:
+        return None
+    return table if table.signature == PARADIGM_SIGNATURE else None
+
+load_data()
+
+# Most a root match can add to a guessed candidate's base confidence, and the
+# factor applied to sandhi candidates. Used to bound a candidate's final
+# confidence before it is scored, so top_k/min_confidence can skip it.
+ROOT_BOOST_MAX = 0.2
+SANDHI_FACTOR = 0.9
+SANDHI_MAX_CONFIDENCE = min(max(info['confidence'] for info in ENDINGS.values()) * SANDHI_FACTOR
+                            + ROOT_BOOST_MAX, 1.0)
+
+def _cannot_rank(bound, heap, top_k, min_confidence):
+    """True if a candidate whose confidence is at most bound cannot be returned"""
+    if min_confidence is not None and bound < min_confidence:
+        return True
+    # Ties rank in generation order, so a later candidate must beat the k-th best
+    return top_k is not None and len(heap) == top_k and bound <= heap[0][0]
+
+def _offer(heap, top_k, min_confidence, match, seq):
+    """Keep match in the bounded heap if it ranks in the top_k above min_confidence"""
+    if min_confidence is not None and match.confidence < min_confidence:
+        return
+    entry = (match.confidence, -seq, match)
+    if top_k is None or len(heap) < top_k:
+        heapq.heappush(heap, entry)
+    elif entry[:2] > heap[0][:2]:
+        heapq.heapreplace(heap, entry)
+
+def _rank_found(matches, top_k, min_confidence):
+    """Rank analyses found by lookup (attested or generated forms) like analyze_endings"""
+    generated = len(matches)
+    matches.sort(key=lambda x: x.confidence, reverse=True)
+    if top_k is not None or min_confidence is not None:
+        matches = [m for m in matches if min_confidence is None or m.confidence >= min_confidence][:top_k]
+    profile = instrumentation.current()
+    if profile:
+        profile.count('candidates_generated', generated)
+        profile.count('candidates_pruned', generated - len(matches))
+        profile.count('matches', len(matches))
+    return matches or None
+
+def paradigm_analyses(verb_form, table):
+    """Analyses of verb_form from the paradigm table, in table order"""
+    matches = []
+    for root, prefix, ending, surface, sandhi in table.lookup(verb_form):
+        info = ENDINGS[ending]
+        confidence = info['confidence'] * SANDHI_FACTOR if sandhi else info['confidence']
+        matches.append(Analysis(
+            Morphology(**info, note=anusvara_note(ending, surface, root), root=root),
+            root,
+            surface,
+            prefix or None,
+            PREFIXES.get(prefix),
+            # The whole stem is an attested root
+            min(confidence + ROOT_BOOST_MAX, 1.0),
+            sandhi_applied=sandhi,
+            notes=('form_generated',)
+        ))
+    return matches
+
+# The search is memoised in two layers, both cleared by
+# clear_search_caches(): the (ending, stem) splits of each prefix-stripped
+# remainder, which the forms of a batch and the prefix chains of one form
+# share, and the score of each split, computed only for splits whose
+# confidence bound can still rank
+REMAINDER_CACHE_SIZE = int(os.environ.get('REMAINDER_CACHE_SIZE', 65536))
+
+@lru_cache(maxsize=REMAINDER_CACHE_SIZE)
+def remainder_splits(verb_form, sandhi):
+    """Return the (ending, test_ending, info, stem) splits of a prefix-stripped form:
+    the direct splits, or with sandhi=True those the sandhi rules reconstruct"""
+    if sandhi:
+        return tuple(sandhi_splits(verb_form))
+    # One backwards walk over the form finds every ending, including the
+    # Mti/Mte variants of nti/nte
+    return tuple((ending, test_ending, info, verb_form[:-len(test_ending)])
+                 for ending, test_ending, info in ENDING_TRIE.match(verb_form))
+
+@lru_cache(maxsize=REMAINDER_CACHE_SIZE)
+def score_split(ending, test_ending, potential_root, sandhi, root_trie):
+    """Return (morphology, confidence, notes) for one split, or None if it is filtered out.
+
+    root_trie is part of the cache key, so scores never outlive a reload.
+    """
+    if not plausible_stem(potential_root, ending):
+        return None
+    if not is_valid_prakrit_sequence(potential_root):
+        return None
+    morphology = Morphology(**ENDINGS[ending], note=anusvara_note(ending, test_ending, potential_root))
+    # Fallback to longest prefix in VERB_ROOTS. This also covers
+    # retrying without a trailing 'e' or 'i': those are prefixes too
+    matched_root = root_trie.longest_prefix(potential_root)
+    morphology.root = matched_root
+    confidence = morphology.confidence * SANDHI_FACTOR if sandhi else morphology.confidence
+    # Confidence logic
+    if matched_root:
+        boost = 0.15 + 0.05 * (len(matched_root) / max(1, len(potential_root)))
+        return morphology, min(confidence + boost, 1.0), ('root_attested',)
+    return morphology, max(confidence - 0.2, 0.1), ('root_unattested',)
+
+def clear_search_caches():
+    remainder_splits.cache_clear()
+    score_split.cache_clear()
+
+def analyze_endings(verb_form, top_k=None, min_confidence=None):
+    """Analyze verb endings to determine person, number, and tense with improved accuracy
+
+    Every split of the form into a chain of prefixes and a remainder (see
+    prefix_chains) is analysed, the bare form included.
+
+    With top_k and/or min_confidence, only the best top_k analyses with at
+    least min_confidence are returned (ranked exactly as in the full list),
+    and candidates that cannot make the cut are dropped before they are built.
+    """
+    if top_k is not None and top_k < 1:
+        raise ValueError("top_k must be at least 1")
+    if min_confidence is not None and not math.isfinite(min_confidence):
+        raise ValueError("min_confidence must be a finite number")
+    bounded = top_k is not None or min_confidence is not None
+    heap = []  # (confidence, -seq, match) when bounded
+    seq = 0
+    chains = [(chain, remainder, *chain_labels(chain)) for chain, remainder in prefix_chains(verb_form)]
+
+    data = DATA
     possible_matches = []
-    vowels = set('aeiouAEIOU')
-    # First, check if verb_form is attested in ALL_VERB_FORMS
-    attested_root = None
-    for root, forms in ALL_VERB_FORMS.items():
-        if verb_form in forms:
-            attested_root = root
-            break
-    if attested_root:
-        # Find ending and position for attested form
-        for ending, info in all_endings.items():
-            if verb_form.endswith(ending):
-                info = info.copy()
-                info['root'] = attested_root
-                match = {
-                    'analysis': info,
-                    'potential_root': attested_root,  # Show attested root
-                    'ending': ending,
-                    'prefix': prefix,
-                    'sanskrit_prefix': sanskrit_prefix,
-                    'confidence': min(info['confidence'] + 0.25, 1.0),
-                    'notes': [f"Form '{verb_form}' attested for root '{attested_root}'."]
-                }
+    profile = instrumentation.current()
+    if profile:
+        start = perf_counter()
+    # First, check if a remainder is attested in ALL_VERB_FORMS
+    for chain, remainder, prefix, sanskrit_prefix in chains:
+        attested_roots = data.form_index.get(remainder, [])
+        if attested_roots:
+            attested_endings = ENDING_TRIE.match(remainder, variants=False)
+        for attested_root in attested_roots:
+            # Find ending and position for attested form
+            for ending, _, info in attested_endings:
+                match = Analysis(
+                    Morphology(**info, root=attested_root),
+                    attested_root,  # Show attested root
+                    ending,
+                    prefix,
+                    sanskrit_prefix,
+                    min(info['confidence'] + 0.25, 1.0),
+                    notes=('form_attested',),
+                    attested_form=remainder
+                )
                 possible_matches.append(match)
-        # If found, return only attested match as highest confidence
+    if profile:
+        profile.add_time('attested', start)
+    # If found, return only attested matches as highest confidence
+    if possible_matches:
+        return _rank_found(possible_matches, top_k, min_confidence)
+    # Next, forms predicted by the paradigm table (python paradigm.py build)
+    if data.paradigms is not None:
+        if profile:
+            start = perf_counter()
+        possible_matches = paradigm_analyses(verb_form, data.paradigms)
+        if profile:
+            profile.add_time('paradigm', start)
         if possible_matches:
-            possible_matches.sort(key=lambda x: x['confidence'], reverse=True)
-            return possible_matches
-    # If not attested, proceed with guessing/hunting as before
-    # Direct matches
-    for ending, info in all_endings.items():
-        # Support Mti/Mte as variants for nti/nte
-        endings_to_check = [ending]
-        if ending == 'nti':
-            endings_to_check.append('Mti')
-        if ending == 'nte':
-            endings_to_check.append('Mte')
-        for test_ending in endings_to_check:
-            if verb_form.endswith(test_ending):
-                potential_root = verb_form[:-len(test_ending)]
-                # Filter: root should not end with 'a'
-                if potential_root.endswith('a'):
+            return _rank_found(possible_matches, top_k, min_confidence)
+    # Otherwise, proceed with guessing/hunting in each remainder: direct
+    # matches, then sandhi matches (undo the sandhi rules on the end of the
+    # form to get the candidate (stem, ending) splits directly)
+    generated = 0
+    for chain, remainder, prefix, sanskrit_prefix in chains:
+        for sandhi, stage in ((False, 'direct'), (True, 'sandhi')):
+            if profile:
+                start = perf_counter()
+            # Stop early if no sandhi analysis could displace the current top_k
+            if sandhi and bounded and _cannot_rank(SANDHI_MAX_CONFIDENCE, heap, top_k, min_confidence):
+                splits = ()
+            else:
+                splits = remainder_splits(remainder, sandhi)
+            factor = SANDHI_FACTOR if sandhi else 1
+            generated += len(splits)
+            for ending, test_ending, info, potential_root in splits:
+                # Skip the split before scoring it if even a full root match
+                # could not rank
+                if bounded and _cannot_rank(min(info['confidence'] * factor + ROOT_BOOST_MAX, 1.0),
+                                            heap, top_k, min_confidence):
                     continue
-                # Filter: 'i' ending must be preceded by a vowel
-                if ending == 'i' and (len(potential_root) == 0 or potential_root[-1] not in vowels):
+                scored = score_split(ending, test_ending, potential_root, sandhi, data.root_trie)
+                if scored is None:
                     continue
-                # Handle Mti/Mte forms (anusvāra)
-                info_copy = info.copy()
-                if test_ending in ['Mti', 'Mte']:
-                    info_copy['note'] = 'Anusvāra (M) used before nti/nte (written as Mti/Mte) in Prakrit.'
-                elif ending in ['nti', 'nte'] and len(potential_root) > 0 and potential_root[-1] == 'M':
-                    info_copy['note'] = 'Anusvāra (M) used before nti/nte in Prakrit.'
-                if is_valid_prakrit_sequence(potential_root):
-                    # Fallback to longest substring in VERB_ROOTS
-                    matched_root = None
-                    for i in range(len(potential_root), 0, -1):
-                        subroot = potential_root[:i]
-                        if subroot in VERB_ROOTS:
-                            matched_root = subroot
-                            break
-                    # If not found, try removing trailing 'e' or 'i' and check again
-                    if not matched_root and potential_root and potential_root[-1] in ['e', 'i']:
-                        alt_root = potential_root[:-1]
-                        for i in range(len(alt_root), 0, -1):
-                            subroot = alt_root[:i]
-                            if subroot in VERB_ROOTS:
-                                matched_root = subroot
-                                break
-                    if matched_root:
-                        info_copy['root'] = matched_root
-                    match = {
-                        'analysis': info_copy,
-                        'potential_root': potential_root,
-                        'ending': test_ending,
-                        'prefix': prefix,
-                        'sanskrit_prefix': sanskrit_prefix,
-                        'confidence': info_copy['confidence']
-                    }
-                    # Confidence logic
-                    if matched_root:
-                        boost = 0.15 + 0.05 * (len(matched_root) / max(1, len(potential_root)))
-                        match['confidence'] = min(match['confidence'] + boost, 1.0)
-                        match.setdefault('notes', []).append(f"Root '{matched_root}' attested in Prakrit verb list.")
-                    else:
-                        match['confidence'] = max(match['confidence'] - 0.2, 0.1)
-                        match.setdefault('notes', []).append("Root not attested in Prakrit verb list.")
+                morphology, confidence, notes = scored
+                match = Analysis(morphology, potential_root, test_ending, prefix, sanskrit_prefix,
+                                 confidence, sandhi_applied=sandhi, notes=notes)
+                if bounded:
+                    seq += 1
+                    _offer(heap, top_k, min_confidence, match, seq)
+                else:
                     possible_matches.append(match)
-    # Sandhi matches
-    for ending, info in all_endings.items():
-        # Support Mti/Mte as variants for nti/nte
-        endings_to_check = [ending]
-        if ending == 'nti':
-            endings_to_check.append('Mti')
-        if ending == 'nte':
-            endings_to_check.append('Mte')
-        for test_ending in endings_to_check:
-            for i in range(1, min(4, len(verb_form))):
-                potential_root = verb_form[:-i]
-                # Filter: root should not end with 'a'
-                if potential_root.endswith('a'):
-                    continue
-                # Filter: 'i' ending must be preceded by a vowel
-                if ending == 'i' and (len(potential_root) == 0 or potential_root[-1] not in vowels):
-                    continue
-                # Handle Mti/Mte forms (anusvāra)
-                info_copy = info.copy()
-                if test_ending in ['Mti', 'Mte']:
-                    info_copy['note'] = 'Anusvāra (M) used before nti/nte (written as Mti/Mte) in Prakrit.'
-                elif ending in ['nti', 'nte'] and len(potential_root) > 0 and potential_root[-1] == 'M':
-                    info_copy['note'] = 'Anusvāra (M) used before nti/nte in Prakrit.'
-                if is_valid_prakrit_sequence(potential_root):
-                    sandhi_form = apply_sandhi_rules(potential_root, ending)
-                    # Also check sandhi for Mti/Mte
-                    sandhi_form_M = apply_sandhi_rules(potential_root, test_ending) if test_ending in ['Mti', 'Mte'] else None
-                    if sandhi_form == verb_form or (sandhi_form_M and sandhi_form_M == verb_form):
-                        # Fallback to longest substring in VERB_ROOTS
-                        matched_root = None
-                        for j in range(len(potential_root), 0, -1):
-                            subroot = potential_root[:j]
-                            if subroot in VERB_ROOTS:
-                                matched_root = subroot
-                                break
-                        # If not found, try removing trailing 'e' or 'i' and check again
-                        if not matched_root and potential_root and potential_root[-1] in ['e', 'i']:
-                            alt_root = potential_root[:-1]
-                            for k in range(len(alt_root), 0, -1):
-                                subroot = alt_root[:k]
-                                if subroot in VERB_ROOTS:
-                                    matched_root = subroot
-                                    break
-                        if matched_root:
-                            info_copy['root'] = matched_root
-                        match = {
-                            'analysis': info_copy,
-                            'potential_root': potential_root,
-                            'ending': test_ending,
-                            'prefix': prefix,
-                            'sanskrit_prefix': sanskrit_prefix,
-                            'confidence': info_copy['confidence'] * 0.9,
-                            'sandhi_applied': True
-                        }
-                        # Confidence logic
-                        if matched_root:
-                            boost = 0.15 + 0.05 * (len(matched_root) / max(1, len(potential_root)))
-                            match['confidence'] = min(match['confidence'] + boost, 1.0)
-                            match.setdefault('notes', []).append(f"Root '{matched_root}' attested in Prakrit verb list.")
-                        else:
-                            match['confidence'] = max(match['confidence'] - 0.2, 0.1)
-                            match.setdefault('notes', []).append("Root not attested in Prakrit verb list.")
-                        possible_matches.append(match)
+            if profile:
+                profile.add_time(stage, start)
+    if bounded:
+        # Best first; equal confidences keep generation order, like the full sort
+        possible_matches = [m for _, _, m in sorted(heap, key=lambda e: (-e[0], -e[1]))]
+    if profile:
+        profile.count('candidates_generated', generated)
+        profile.count('candidates_pruned', generated - len(possible_matches))
+        profile.count('matches', len(possible_matches))
     if not possible_matches:
         return None
-    possible_matches.sort(key=lambda x: x['confidence'], reverse=True)
+    possible_matches.sort(key=lambda x: x.confidence, reverse=True)
     return possible_matches
 
 @app.route('/', methods=['GET'])
 def index():
     return render_template('analyzer.html')
 
+# Returned (with status 400) when analyze_endings finds nothing
+NO_ANALYSIS = {
+    "error": "Could not analyze this form. It may not be a valid Prakrit verb form.",
+    "suggestions": [
+        "Check if the input follows Prakrit phonological rules",
+        "Ensure the ending is a valid Prakrit verb ending",
+        "Verify the transliteration if using Harvard-Kyoto"
+    ]
+}
+
+# Token pattern for running text: anything between whitespace, digits
+# (Latin or Devanagari), dandas and ASCII punctuation
+TOKEN_PATTERN = re.compile(r'[^\s\d\u0964-\u096F.,;:!?"()\[\]{}|-]+')
+
+def tokenize(text):
+    """Split running text into candidate verb-form tokens"""
+    return TOKEN_PATTERN.findall(text)
+
+def normalize_form(verb_form):
+    """Detect the script of verb_form and return (script, HK working form)"""
+    profile = instrumentation.current()
+    if profile:
+        start = perf_counter()
+    detected_script = detect_script(verb_form)
+    working_form = verb_form
+    if detected_script == 'devanagari':
+        working_form = transliterate(verb_form, 'devanagari', 'hk')
+    # Preprocess HK input: replace 'ai' with 'a_i' for hiatus handling
+    if detected_script == 'hk' or (detected_script == 'devanagari' and working_form):
+        # Only replace if not already a_i
+        working_form = re.sub(r'(?<!_)ai', 'a_i', working_form)
+    if profile:
+        profile.add_time('transliteration', start)
+    return detected_script, working_form
+
+def render_results(analyses, compact=False):
+    """Render analyses as /analyze results, with reliability and notes (cached per form)"""
+    return [analysis.to_result(compact) for analysis in analyses]
+
+def build_results(verb_form, detected_script, working_form, rendered):
+    """Add the request's input form and script to each rendered result"""
+    results = []
+    for rendered_result in rendered:
+        result = {
+            "original_form": verb_form,
+            "script": detected_script,
+            **rendered_result
+        }
+        # If the original was in Devanagari, add HK transliteration
+        if detected_script == 'devanagari':
+            result["hk_form"] = working_form
+        results.append(result)
+    return results
+
+def analyze_form(verb_form, top_k=None, min_confidence=None, compact=False):
+    """Analyze one form; return the /analyze payload (results or NO_ANALYSIS)
+
+    compact=True sends note and reliability codes (see records.NOTE_TEMPLATES)
+    instead of English sentences.
+    """
+    detected_script, working_form = normalize_form(verb_form)
+    refresh_data_if_changed()
+    # The cache holds rendered results, so each format (and limited results)
+    # is cached separately from the full list
+    if top_k is None and min_confidence is None:
+        cache_key = (working_form, compact)
+    else:
+        cache_key = (working_form, top_k, min_confidence, compact)
+    generation = DATA.generation
+    rendered = RESULT_CACHE.get(cache_key)
+    if rendered is None:
+        def compute():
+            analyses = analyze_endings(working_form, top_k, min_confidence) or []
+            profile = instrumentation.current()
+            if profile:
+                start = perf_counter()
+            rendered = render_results(analyses, compact)
+            if profile:
+                profile.add_time('describe', start)
+            RESULT_CACHE.put(cache_key, rendered, generation)
+            return rendered
+        # Identical forms arriving together (e.g. a class looking up the
+        # same word) share one analysis, unless the data was reloaded
+        # since it started
+        rendered = IN_FLIGHT.run((generation, cache_key), compute)
+    if not rendered:
+        return NO_ANALYSIS
+    profile = instrumentation.current()
+    if profile:
+        start = perf_counter()
+    results = build_results(verb_form, detected_script, working_form, rendered)
+    if profile:
+        profile.add_time('describe', start)
+    return {"results": results}
+
+def iter_batch_results(forms, top_k=None, min_confidence=None, compact=False):
+    """Yield one NDJSON-ready record per form, in input order.
+
+    Each distinct form is analysed once; repeats reuse the first result.
+    """
+    seen = {}
+    for form in forms:
+        if form not in seen:
+            profile = instrumentation.begin()
+            try:
+                seen[form] = analyze_form(form, top_k, min_confidence, compact)
+            except Exception as e:
+                seen[form] = {"error": str(e)}
+            finally:
+                instrumentation.end(profile)
+        yield {"input": form, **seen[form]}
+
+def parse_limits(values):
+    """Read the optional top_k and min_confidence request parameters.
+
+    Raises ValueError with a message for the client if either is malformed.
+    """
+    top_k = values.get('top_k') or None
+    min_confidence = values.get('min_confidence') or None
+    try:
+        top_k = int(top_k) if top_k is not None else None
+        min_confidence = float(min_confidence) if min_confidence is not None else None
+    except ValueError:
+        raise ValueError("top_k must be an integer and min_confidence a number")
+    if top_k is not None and top_k < 1:
+        raise ValueError("top_k must be at least 1")
+    if min_confidence is not None and not math.isfinite(min_confidence):
+        raise ValueError("min_confidence must be a finite number")
+    return top_k, min_confidence
+
+def wants_compact(values):
+    """True if the client asked for the compact response format (format=compact)"""
+    return values.get('format') == 'compact'
+
+def json_response(payload, status=200):
+    """A JSON response serialised with records.dumps (orjson when installed)"""
+    return Response(dumps(payload), status=status, mimetype='application/json')
+
+def iter_ndjson(records):
+    for record in records:
+        yield dumps(record) + '\n'
+
 @app.route('/analyze', methods=['POST'])
 def analyze():
     verb_form = request.form.get('verb_form', '')
@@ -324,61 +745,101 @@ def analyze():
         return jsonify({"error": "Please provide a verb form"}), 400
     
     try:
-        # Detect script and convert to HK if needed
-        detected_script = detect_script(verb_form)
-        working_form = verb_form
-        if detected_script == 'devanagari':
-            working_form = transliterate(verb_form, 'devanagari', 'hk')
-        # Preprocess HK input: replace 'ai' with 'a_i' for hiatus handling
-        if detected_script == 'hk' or (detected_script == 'devanagari' and working_form):
-            # Only replace if not already a_i
-            working_form = re.sub(r'(?<!_)ai', 'a_i', working_form)
-        # Analyze the form
-        possibilities = analyze_endings(working_form)
-        if not possibilities:
-            return jsonify({
-                "error": "Could not analyze this form. It may not be a valid Prakrit verb form.",
-                "suggestions": [
-                    "Check if the input follows Prakrit phonological rules",
-                    "Ensure the ending is a valid Prakrit verb ending",
-                    "Verify the transliteration if using Harvard-Kyoto"
-                ]
-            }), 400
-        # Build results for all possibilities
-        results = []
-        for analysis in possibilities:
-            result = {
-                "original_form": verb_form,
-                "script": detected_script,
-                **analysis
-            }
-            # Add confidence level interpretation
-            if analysis['confidence'] >= 0.9:
-                result['reliability'] = "High confidence analysis"
-            elif analysis['confidence'] >= 0.7:
-                result['reliability'] = "Medium confidence analysis"
-            else:
-                result['reliability'] = "Low confidence analysis - please verify"
-            # Add explanatory notes based on the analysis
-            notes = []
-            if analysis.get('prefix'):
-                notes.append(f"Found verbal prefix '{analysis['prefix']}' (Sanskrit: '{analysis['sanskrit_prefix']}')")
-            if analysis.get('sandhi_applied'):
-                notes.append("Sandhi rules were applied in this analysis")
-            if analysis['analysis']['tense'] == 'past' and analysis['analysis']['person'] == 'all':
-                notes.append("Note: Past tense forms in Prakrit are the same for all persons and numbers")
-            result['notes'] = notes
-            # If the original was in Devanagari, add HK transliteration
-            if detected_script == 'devanagari':
-                result["hk_form"] = working_form
-            results.append(result)
-        return jsonify({"results": results})
+        top_k, min_confidence = parse_limits(request.values)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # ?profile=1 collects stage timings for this request and returns them inline
+    show_profile = request.args.get('profile') == '1'
+    profile = instrumentation.begin(force=show_profile)
+    try:
+        payload = analyze_form(verb_form, top_k, min_confidence, wants_compact(request.values))
+        status = 400 if payload is NO_ANALYSIS else 200
+        # The inline profile is taken before serialising, so it leaves out
+        # the serialisation time that /metrics records
+        if show_profile:
+            payload = {**payload, "profile": profile.as_dict()}
+        if profile:
+            start = perf_counter()
+        response = json_response(payload, status)
+        if profile:
+            profile.add_time('serialisation', start)
+        return response
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+    finally:
+        instrumentation.end(profile)
+
+@app.route('/analyze/codes', methods=['GET'])
+def analyze_codes():
+    """Sentences for the note and reliability codes of the compact format"""
+    return jsonify({"notes": NOTE_TEMPLATES, "reliability": RELIABILITY})
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    # Per process: under gunicorn, the worker that served this request
+    return jsonify({**RESULT_CACHE.stats(), "pid": os.getpid()})
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Stage timings, candidate counters and cache statistics for Prometheus"""
+    cache = RESULT_CACHE.stats()
+    extra = [
+        ('analyzer_cache_hits_total', 'counter', 'Result cache hits.', cache['hits']),
+        ('analyzer_cache_misses_total', 'counter', 'Result cache misses.', cache['misses']),
+        ('analyzer_cache_evictions_total', 'counter', 'Result cache evictions.', cache['evictions']),
+        ('analyzer_cache_size', 'gauge', 'Entries in the result cache.', cache['size']),
+        ('analyzer_coalesced_total', 'counter', 'Requests that waited for an identical in-flight analysis.',
+         IN_FLIGHT.coalesced),
+    ]
+    # Memoised search caches (reset when the data reloads)
+    for name, cached in (('remainder', remainder_splits), ('score', score_split)):
+        info = cached.cache_info()
+        extra += [
+            (f'analyzer_{name}_cache_hits_total', 'counter', f'Memoised {name} cache hits.', info.hits),
+            (f'analyzer_{name}_cache_misses_total', 'counter', f'Memoised {name} cache misses.', info.misses),
+        ]
+    return Response(instrumentation.render(extra), mimetype='text/plain; version=0.0.4')
+
+@app.route('/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """Analyze many forms: a JSON array of strings or one form per line.
+
+    Streams NDJSON back, one record per input form in input order. The
+    top_k, min_confidence and format query parameters apply to every form.
+    """
+    try:
+        top_k, min_confidence = parse_limits(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if request.is_json:
+        forms = request.get_json(silent=True)
+        if not isinstance(forms, list) or not all(isinstance(f, str) for f in forms):
+            return jsonify({"error": "Expected a JSON array of verb forms"}), 400
+        forms = [f.strip() for f in forms]
+    else:
+        forms = [line.strip() for line in request.get_data(as_text=True).splitlines()]
+    forms = [f for f in forms if f]
+    if not forms:
+        return jsonify({"error": "Please provide at least one verb form"}), 400
+    records = iter_batch_results(forms, top_k, min_confidence, wants_compact(request.args))
+    return Response(iter_ndjson(records), mimetype='application/x-ndjson')
 
 if __name__ == '__main__':
     import sys
-    if len(sys.argv) > 1:
+    if len(sys.argv) > 1 and sys.argv[1] == '--batch':
+        # Batch mode: python verb_analyzer.py --batch [file|-]
+        # Tokenises the text and writes one NDJSON record per token
+        path = sys.argv[2] if len(sys.argv) > 2 else '-'
+        if path == '-':
+            text = sys.stdin.read()
+        else:
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+        for line in iter_ndjson(iter_batch_results(tokenize(text))):
+            sys.stdout.write(line)
+        sys.exit(0)
+    elif len(sys.argv) > 1:
         # CLI mode: python verb_analyzer.py <verb_form>
         verb_form = sys.argv[1]
         detected_script = detect_script(verb_form)
@@ -392,15 +853,15 @@ if __name__ == '__main__':
         print(f"Analysis for: {verb_form} (script: {detected_script})")
         for i, analysis in enumerate(possibilities, 1):
             print(f"\nPossibility {i}:")
-            print(f"  Tense: {analysis['analysis']['tense']}")
-            print(f"  Person: {analysis['analysis']['person']}")
-            print(f"  Number: {analysis['analysis']['number']}")
-            print(f"  Root: {analysis['potential_root']}")
-            print(f"  Ending: {analysis['ending']}")
-            print(f"  Confidence: {analysis['confidence']}")
-            if analysis.get('prefix'):
-                print(f"  Prefix: {analysis['prefix']} (Sanskrit: {analysis['sanskrit_prefix']})")
-            if analysis.get('sandhi_applied'):
+            print(f"  Tense: {analysis.analysis.tense}")
+            print(f"  Person: {analysis.analysis.person}")
+            print(f"  Number: {analysis.analysis.number}")
+            print(f"  Root: {analysis.potential_root}")
+            print(f"  Ending: {analysis.ending}")
+            print(f"  Confidence: {analysis.confidence}")
+            if analysis.prefix:
+                print(f"  Prefix: {analysis.prefix} (Sanskrit: {analysis.sanskrit_prefix})")
+            if analysis.sandhi_applied:
                 print("  Sandhi rules applied")
         sys.exit(0)
     else: